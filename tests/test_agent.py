@@ -0,0 +1,134 @@
+"""Tests for think_tank.agent."""
+
+from think_tank.agent import DebateAgent, format_move
+from think_tank.schemas import Claim, Expert, Move, RoundSpec
+
+
+def _agent(is_synthesizer=False):
+    expert = Expert(id="e1", name="Dr. Test", title="Analyst")
+    return DebateAgent(expert=expert, client=None,
+                       is_synthesizer=is_synthesizer)
+
+
+class TestParseResponse:
+    def test_fenced_json(self):
+        text = (
+            "Here is my move.\n"
+            "```json\n"
+            '{"move_type": "object", "content": "Analysis",'
+            ' "claims": [{"id": "M001_C1", "text": "Claim",'
+            ' "confidence": 0.6, "evidence": [{"source": "S", "quote": "Q"}],'
+            ' "stance": "contra"}],'
+            ' "targets": ["M000_C2"]}\n'
+            "```\n"
+            "Thanks."
+        )
+        move = _agent()._parse_response(text, "M001", 2)
+        assert move.move_type == "object"
+        assert move.content == "Analysis"
+        assert move.round == 2
+        assert move.claims[0].confidence == 0.6
+        assert move.claims[0].evidence[0].source == "S"
+        assert move.targets == ["M000_C2"]
+
+    def test_claim_defaults_for_missing_keys(self):
+        text = '{"claims": [{"text": "Sparse", "evidence": [{"source": "S"}]}]}'
+        claim = _agent()._parse_response(text, "M006", 1).claims[0]
+        assert claim.id == ""
+        assert claim.confidence == 0.7
+        assert claim.stance == "neutral"
+        assert claim.evidence[0].quote == ""
+
+    def test_bare_fence(self):
+        text = '```\n{"content": "Plain fence", "claims": []}\n```'
+        move = _agent()._parse_response(text, "M002", 1)
+        assert move.content == "Plain fence"
+
+    def test_unfenced_json(self):
+        move = _agent()._parse_response('{"content": "Raw"}', "M003", 1)
+        assert move.content == "Raw"
+
+    def test_invalid_json_falls_back_to_text(self, caplog):
+        move = _agent()._parse_response("Not JSON at all", "M004", 1)
+        assert "[WARN] No JSON object in response from e1" in caplog.text
+        assert move.move_type == "claim"
+        assert move.content == "Not JSON at all"
+        assert move.claims == []
+
+    def test_malformed_object_falls_back_to_text(self):
+        move = _agent()._parse_response('{"content": "cut off', "M007", 1)
+        assert move.content == '{"content": "cut off'
+        assert move.claims == []
+
+        move = _agent()._parse_response('{"content": unquoted}', "M008", 1)
+        assert move.content == '{"content": unquoted}'
+
+    def test_synthesizer_keeps_raw_text(self):
+        move = _agent(is_synthesizer=True)._parse_response(
+            "# Final report", "M005", 3,
+        )
+        assert move.move_type == "synthesize"
+        assert move.content == "# Final report"
+
+
+class TestPrompts:
+    def test_system_prompt_built_once(self):
+        agent = _agent()
+        assert agent._system_prompt.startswith("You are Dr. Test, Analyst.")
+        assert "RULES:" in agent._system_prompt
+
+    def test_synthesizer_system_prompt(self):
+        assert "DEBATE SYNTHESIZER" in _agent(is_synthesizer=True)._system_prompt
+
+    def test_static_context_is_cached_prefix(self):
+        agent = _agent()
+        rnd = RoundSpec(number=2, focus="F", question="Q?", agents=["e1"])
+        prior = [format_move(Move(move_id="M001", agent_id="e2",
+                                  agent_title="Other", round=1,
+                                  content="Earlier move"))]
+        request = agent._build_request(rnd, "PROBLEM", prior, "M002",
+                                       "LESSON", "")
+
+        context, persona = request["system"]
+        assert context["cache_control"] == {"type": "ephemeral"}
+        assert context["text"].startswith("PROBLEM")
+        assert "LESSON" in context["text"]
+        assert persona["text"] == agent._system_prompt
+
+        user = request["messages"][0]["content"]
+        assert "PROBLEM" not in user and "LESSON" not in user
+        assert user.startswith("# PRIOR DEBATE MOVES\n")
+        assert "Earlier move" in user
+
+    def test_precompiled_system_blocks_are_reused(self):
+        agent = _agent()
+        rnd = RoundSpec(number=1, focus="F", question="Q?", agents=["e1"])
+        agent.precompile("PROBLEM", "LESSON")
+        first = agent._build_request(rnd, "PROBLEM", [], "M001", "LESSON", "")
+        second = agent._build_request(rnd, "PROBLEM", [], "M002", "LESSON", "")
+        assert first["system"] is second["system"]
+
+        # A different context is rendered fresh
+        other = agent._build_request(rnd, "OTHER", [], "M003", "", "")
+        assert other["system"][0]["text"] == "OTHER"
+
+    def test_expert_sees_last_six_fragments(self):
+        fragments = [f"<move {i}>" for i in range(8)]
+        rnd = RoundSpec(number=3, focus="F", question="Q?", agents=["e1"])
+
+        expert = _agent()._build_user_prompt(rnd, fragments, "M009")
+        assert "<move 1>" not in expert
+        assert "<move 2><move 3>" in expert and "<move 7>" in expert
+
+        synth = _agent(is_synthesizer=True)._build_user_prompt(rnd, fragments, "M009")
+        assert "".join(fragments) in synth
+
+    def test_format_move(self):
+        move = Move(move_id="M001", agent_id="e1", agent_title="Analyst",
+                    round=2, move_type="object", content="x" * 2000,
+                    claims=[Claim(id=f"C{i}", text="claim", confidence=0.5)
+                            for i in range(6)])
+        fragment = format_move(move)
+        assert fragment.startswith("\n\n## [Analyst] Round 2 — object\n")
+        assert fragment.count("x") == 1500
+        assert fragment.count("\n  - [0.50] claim") == 4
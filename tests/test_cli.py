@@ -0,0 +1,121 @@
+"""Tests for think_tank.cli."""
+
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from think_tank import __version__, loader
+from think_tank.cli import (
+    _sniff_subcommand, cmd_list, cmd_replay, cmd_run, main,
+)
+from think_tank.schemas import Claim, DebateState, Move
+
+
+class TestMain:
+    def test_version_fast_path(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "argv", ["think-tank", "--version"])
+        main()
+        assert capsys.readouterr().out.strip() == f"think-tank {__version__}"
+
+    def test_help_lists_all_commands(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "argv", ["think-tank", "-h"])
+        main()
+        out = capsys.readouterr().out
+        for name in ("run", "list", "check-forecasts", "replay", "resolve"):
+            assert name in out
+
+    def test_no_args_exits_nonzero(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "argv", ["think-tank"])
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 1
+
+    def test_sniff_subcommand(self):
+        assert _sniff_subcommand(["think-tank", "run", "--spec", "s"]) == "run"
+        assert _sniff_subcommand(["think-tank", "--help"]) is None
+
+
+class TestListCache:
+    def _args(self, tmp_path):
+        return SimpleNamespace(panels_dir=str(tmp_path / "panels"),
+                               specs_dir=str(tmp_path / "specs"))
+
+    def test_warm_listing_skips_yaml(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        (tmp_path / "panels").mkdir()
+        (tmp_path / "specs").mkdir()
+        (tmp_path / "panels" / "p.yaml").write_text(
+            "name: Cached Panel\nexperts:\n  - id: e1\n    name: E1\n"
+        )
+        (tmp_path / "specs" / "s.yaml").write_text(
+            "title: Cached Spec\nrounds:\n  - agents: [e1]\n"
+        )
+
+        cmd_list(self._args(tmp_path))
+        cold = capsys.readouterr().out
+        assert (tmp_path / "cache" / "think-tank" / "listing.json").exists()
+
+        def fail(path):
+            raise AssertionError("cache miss")
+
+        monkeypatch.setattr(loader, "load_panel", fail)
+        monkeypatch.setattr(loader, "load_spec", fail)
+        cmd_list(self._args(tmp_path))
+        assert capsys.readouterr().out == cold
+        assert "Cached Panel (1 experts)" in cold
+        assert "Cached Spec (1 rounds)" in cold
+
+
+class TestReplay:
+    def test_replay_output(self, tmp_path, capsys):
+        state = DebateState(
+            spec_title="Replay Debate", panel_name="P", model="m",
+            synth_model="s", num_experts=1, num_rounds=1,
+            moves=[Move(move_id="M001", agent_id="e1", agent_title="Expert One",
+                        round=1, move_type="claim", content="Opening",
+                        claims=[Claim(id="C1", text="A claim", confidence=0.8)])],
+        )
+        path = tmp_path / "debate_state.json"
+        path.write_text(json.dumps(state.to_dict()))
+
+        cmd_replay(SimpleNamespace(state_file=str(path)))
+        out = capsys.readouterr().out
+        assert out.startswith("\n" + "=" * 60 + "\nREPLAY: Replay Debate\n")
+        assert "\n--- Round 1 ---\n\n[Expert One] (claim)\n  Opening...\n" in out
+        assert out.endswith("    [0.80] A claim\n\n")
+
+
+class TestRun:
+    def test_dry_run_reads_only_panel_header(self, tmp_path, monkeypatch,
+                                             capsys):
+        panel = tmp_path / "panel.yaml"
+        panel.write_text("name: Header Only\nexperts:\n  - id: e1\n")
+        spec = tmp_path / "spec.yaml"
+        spec.write_text("title: Dry Spec\nrounds:\n  - agents: [e1, e2]\n")
+
+        def fail(path):
+            raise AssertionError("full panel load")
+
+        monkeypatch.setattr(loader, "load_panel", fail)
+        cmd_run(SimpleNamespace(
+            spec=str(spec), panel=str(panel), dry_run=True, api_key=None,
+            model="claude-sonnet-4-6", synth_model="claude-opus-4-6",
+        ))
+        out = capsys.readouterr().out
+        assert "DRY RUN: Dry Spec" in out
+        assert "Panel: Header Only\n" in out
+        assert "API calls: 2" in out
+
+    @pytest.mark.parametrize("value", ["0", "-2", "many"])
+    def test_max_concurrency_must_be_positive(self, value, monkeypatch,
+                                              capsys):
+        monkeypatch.setattr(sys, "argv", [
+            "think-tank", "run", "--spec", "s", "--panel", "p",
+            "--max-concurrency", value,
+        ])
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 2
+        assert "positive integer" in capsys.readouterr().err
@@ -0,0 +1,10 @@
+"""Tests for think_tank._json."""
+
+from think_tank import _json
+
+
+class TestDumps:
+    def test_stdlib_fallback_is_compact(self, monkeypatch):
+        monkeypatch.setattr(_json, "orjson", None)
+        assert _json.dumps({"a": [1, "é"]}) == '{"a":[1,"é"]}'.encode()
+        assert _json.dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
@@ -3,9 +3,21 @@
 import os
 import tempfile
 
+import pytest
 import yaml
 
-from think_tank.loader import load_panel, load_spec, validate_spec_against_panel
+from think_tank.loader import (
+    discover_files, load_panel, load_panel_header, load_spec, validate_spec_against_panel,
+    _panel_from_dict, _safe_loader, _spec_from_dict,
+)
+from think_tank.schemas import DebateSpec, Expert, Panel, RoundSpec
+
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def test_uses_libyaml_when_available():
+    expected = "CSafeLoader" if yaml.__with_libyaml__ else "SafeLoader"
+    assert _safe_loader().__name__ == expected
 
 
 class TestLoadPanel:
@@ -22,7 +34,7 @@ class TestLoadPanel:
         }
         path = tmp_path / "panel.yaml"
         with open(path, "w") as f:
-            yaml.dump(data, f)
+            yaml.dump(data, f, Dumper=_Dumper)
 
         panel = load_panel(str(path))
         assert panel.name == "Test Panel"
@@ -40,7 +52,7 @@ class TestLoadPanel:
         }
         path = tmp_path / "ww3.yaml"
         with open(path, "w") as f:
-            yaml.dump(data, f)
+            yaml.dump(data, f, Dumper=_Dumper)
 
         panel = load_panel(str(path))
         assert panel.experts[0].title == "DIA Director"
@@ -58,6 +70,77 @@ class TestLoadPanel:
         assert panel.name == "Geopolitical 42"
         assert len(panel.experts) == 42
 
+    def test_cache_reuses_and_invalidates(self, tmp_path):
+        path = tmp_path / "panel.yaml"
+        with open(path, "w") as f:
+            yaml.dump({"name": "First", "experts": []}, f, Dumper=_Dumper)
+
+        first = load_panel(str(path))
+        assert load_panel(str(path)) is first
+
+        with open(path, "w") as f:
+            yaml.dump({"name": "Second edition", "experts": []}, f,
+                      Dumper=_Dumper)
+        assert load_panel(str(path)).name == "Second edition"
+
+    def test_non_ascii_utf8(self, tmp_path):
+        path = tmp_path / "intl.yaml"
+        path.write_bytes(
+            "name: Zürich Panel\nexperts:\n"
+            "  - id: e1\n    name: Dr. Müller\n    title: Économiste\n"
+            .encode("utf-8")
+        )
+        panel = load_panel(str(path))
+        assert panel.name == "Zürich Panel"
+        assert panel.experts[0].title == "Économiste"
+        assert load_panel_header(str(path)) == ("Zürich Panel", "")
+
+
+def test_discover_files(tmp_path):
+    for name in ("b.yaml", "a.yml", "_private.yaml", "notes.txt"):
+        (tmp_path / name).write_text("name: x\n")
+    (tmp_path / "dir.yaml").mkdir()
+    assert discover_files(str(tmp_path)) == [
+        (str(tmp_path / "a.yml"), "a"),
+        (str(tmp_path / "b.yaml"), "b"),
+    ]
+    assert discover_files(str(tmp_path / "missing")) == []
+
+
+class TestLoadPanelHeader:
+    def test_header_matches_full_load(self, tmp_path):
+        data = {
+            "experts": [
+                {"id": "e1", "name": "Nested name", "title": "T",
+                 "description": "Nested description"},
+            ],
+            "name": "Header Panel",
+            "description": "Keys after the expert list",
+        }
+        path = tmp_path / "panel.yaml"
+        with open(path, "w") as f:
+            yaml.dump(data, f, Dumper=_Dumper, sort_keys=False)
+
+        panel = load_panel(str(path))
+        assert load_panel_header(str(path)) == (panel.name, panel.description)
+
+    def test_header_defaults(self, tmp_path):
+        path = tmp_path / "bare.yaml"
+        with open(path, "w") as f:
+            yaml.dump({"experts": []}, f, Dumper=_Dumper)
+        assert load_panel_header(str(path)) == ("bare", "")
+
+    @pytest.mark.parametrize("text", [
+        'name: ""\n', "name: ~\n", "name: yes\n", "name: 12\n",
+        "description: ~\n", "name: &n Shared\ndescription: *n\n",
+        "name: [a, b]\n",
+    ])
+    def test_scalars_resolve_like_full_load(self, tmp_path, text):
+        path = tmp_path / "odd.yaml"
+        path.write_text(text + "experts: []\n")
+        panel = load_panel(str(path))
+        assert load_panel_header(str(path)) == (panel.name, panel.description)
+
 
 class TestLoadSpec:
     def test_load(self, tmp_path):
@@ -69,17 +152,19 @@ class TestLoadSpec:
                 {"number": 1, "focus": "Intro", "question": "Q1?",
                  "agents": ["e1", "e2"]},
                 {"number": 2, "focus": "Synthesis", "question": "Q2?",
-                 "agents": ["synthesizer"]},
+                 "agents": ["synthesizer"], "sequential": True},
             ],
         }
         path = tmp_path / "spec.yaml"
         with open(path, "w") as f:
-            yaml.dump(data, f)
+            yaml.dump(data, f, Dumper=_Dumper)
 
         spec = load_spec(str(path))
         assert spec.title == "Test Debate"
         assert len(spec.rounds) == 2
         assert spec.rounds[0].agents == ["e1", "e2"]
+        assert not spec.rounds[0].sequential
+        assert spec.rounds[1].sequential
 
     def test_load_real_spec(self):
         """Load the actual ww3_project_review.yaml spec."""
@@ -94,7 +179,7 @@ class TestLoadSpec:
 
 
 class TestValidation:
-    def test_valid(self, tmp_path):
+    def test_valid(self):
         panel_data = {
             "name": "P",
             "experts": [
@@ -113,19 +198,12 @@ class TestValidation:
             ],
         }
 
-        pp = tmp_path / "panel.yaml"
-        sp = tmp_path / "spec.yaml"
-        with open(pp, "w") as f:
-            yaml.dump(panel_data, f)
-        with open(sp, "w") as f:
-            yaml.dump(spec_data, f)
-
-        panel = load_panel(str(pp))
-        spec = load_spec(str(sp))
+        panel = _panel_from_dict(panel_data)
+        spec = _spec_from_dict(spec_data)
         warnings = validate_spec_against_panel(spec, panel)
         assert warnings == []
 
-    def test_missing_agent(self, tmp_path):
+    def test_missing_agent(self):
         panel_data = {
             "name": "P",
             "experts": [{"id": "e1", "name": "E1", "title": "T1"}],
@@ -139,15 +217,37 @@ class TestValidation:
             ],
         }
 
-        pp = tmp_path / "panel.yaml"
-        sp = tmp_path / "spec.yaml"
-        with open(pp, "w") as f:
-            yaml.dump(panel_data, f)
-        with open(sp, "w") as f:
-            yaml.dump(spec_data, f)
-
-        panel = load_panel(str(pp))
-        spec = load_spec(str(sp))
+        panel = _panel_from_dict(panel_data)
+        spec = _spec_from_dict(spec_data)
         warnings = validate_spec_against_panel(spec, panel)
         assert len(warnings) == 1
         assert "missing_agent" in warnings[0]
+
+    def test_reflects_later_edits(self):
+        panel = Panel(name="P", experts=[Expert(id="e1", name="E1", title="T1")])
+        spec = DebateSpec(title="S", context="", rounds=[
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1", "e2"]),
+        ])
+        assert "'e2'" in validate_spec_against_panel(spec, panel)[0]
+
+        panel.experts = panel.experts + [Expert(id="e2", name="E2", title="T2")]
+        spec.rounds[0].agents.append("e9")
+        warnings = validate_spec_against_panel(spec, panel)
+        assert len(warnings) == 1 and "'e9'" in warnings[0]
+
+    def test_depends_on_scalar_and_errors(self):
+        spec = _spec_from_dict({"rounds": [
+            {"number": 1, "agents": ["e1"]},
+            {"number": 2, "agents": ["e2"], "depends_on": 1},
+        ]})
+        assert spec.rounds[1].depends_on == [1]
+
+        with pytest.raises(ValueError, match="depends_on must be"):
+            _spec_from_dict({"rounds": [{"number": 1, "depends_on": "one"}]})
+        with pytest.raises(ValueError, match="unknown"):
+            _spec_from_dict({"rounds": [{"number": 1, "depends_on": [3]}]})
+        with pytest.raises(ValueError, match="cycle"):
+            _spec_from_dict({"rounds": [
+                {"number": 1, "depends_on": [2]},
+                {"number": 2, "depends_on": [1]},
+            ]})
@@ -2,8 +2,9 @@
 
 import json
 import os
+from types import SimpleNamespace
 
-from think_tank.memory import MemoryManager
+from think_tank.memory import MemoryManager, _iter_summary
 from think_tank.schemas import (
     Lesson, Forecast, ExpertPerformance, DebateState, Move, Claim,
 )
@@ -58,6 +59,31 @@ class TestMemoryManager:
         mm = MemoryManager(str(tmp_path))
         assert mm.load_context() == ""
 
+    def test_extract_lessons_from_fenced_reply(self, tmp_path):
+        reply = (
+            "Lessons:\n```json\n"
+            '[{"text": "First", "category": "bias"}, {"text": "Second"}]'
+            "\n```"
+        )
+        client = SimpleNamespace(messages=SimpleNamespace(
+            create=lambda **kw: SimpleNamespace(
+                content=[SimpleNamespace(text=reply)]),
+        ))
+        state = DebateState(
+            spec_title="Test", panel_name="P", model="m", synth_model="s",
+            num_experts=1, num_rounds=1,
+        )
+        mm = MemoryManager(str(tmp_path))
+        mm.save_lessons([Lesson(id="L0", text="Earlier", source_debate="Old",
+                                category="domain")])
+        mm.extract_lessons_from_debate(state, client)
+
+        lessons = mm.load_lessons()
+        assert [l.text for l in lessons] == ["Earlier", "First", "Second"]
+        assert lessons[1].category == "bias"
+        assert lessons[1].id.endswith("_00")
+        assert lessons[2].id.endswith("_01")
+
 
 class TestForecasts:
     def test_add_and_load(self, tmp_path):
@@ -71,6 +97,24 @@ class TestForecasts:
         assert len(loaded) == 1
         assert loaded[0].id == "F1"
 
+    def test_add_appends_to_log_then_compacts(self, tmp_path):
+        mm = MemoryManager(str(tmp_path))
+        mm.save_forecasts([Forecast(
+            id="F0", text="Existing", probability=0.4,
+            deadline="2026-06-01", source_debate="Test",
+        )])
+        mm.add_forecast(Forecast(
+            id="F1", text="Appended", probability=0.7,
+            deadline="2026-06-01", source_debate="Test",
+        ))
+        with open(tmp_path / "forecasts.json") as fh:
+            assert [d["id"] for d in json.load(fh)] == ["F0"]
+
+        assert [f.id for f in mm.load_forecasts()] == ["F0", "F1"]
+        assert (tmp_path / "forecasts.jsonl").read_text() == ""
+        with open(tmp_path / "forecasts.json") as fh:
+            assert [d["id"] for d in json.load(fh)] == ["F0", "F1"]
+
     def test_resolve(self, tmp_path):
         mm = MemoryManager(str(tmp_path))
         f = Forecast(
@@ -84,6 +128,10 @@ class TestForecasts:
         assert loaded[0].outcome is True
         assert loaded[0].brier_score is not None
 
+        with open(tmp_path / "forecasts.json") as fh:
+            raw = json.load(fh)
+        assert abs(raw[0]["brier_score"] - 0.04) < 1e-9
+
     def test_check_forecasts_empty(self, tmp_path):
         mm = MemoryManager(str(tmp_path))
         result = mm.check_forecasts()
@@ -103,6 +151,8 @@ class TestForecasts:
         result = mm.check_forecasts()
         assert "Resolved" in result
         assert "Pending" in result
+        assert "[0.0100] Resolved forecast" in result
+        assert "deadline: 2026-12-01" in result
 
 
 class TestPerformance:
@@ -134,3 +184,21 @@ class TestPerformance:
         assert perf["expert_a"].total_claims == 2
         assert perf["expert_b"].total_claims == 1
         assert perf["expert_b"].challenges_made == 1
+
+
+class TestDebateSummary:
+    def test_summary_stops_at_budget(self):
+        moves = [
+            Move(move_id=f"M{i:03d}", agent_id="e1", agent_title="E1",
+                 round=1, move_type="claim", content="",
+                 claims=[Claim(id="C1", text="x" * 300, confidence=0.5)])
+            for i in range(200)
+        ]
+        state = DebateState(
+            spec_title="T", panel_name="P", model="m", synth_model="s",
+            num_experts=1, num_rounds=1, moves=moves,
+        )
+        lines = list(_iter_summary(state))
+        assert lines[0] == "Debate: T"
+        assert len(lines) < 4 + len(moves)
+        assert len("\n".join(lines)) >= 8000
@@ -0,0 +1,414 @@
+"""Tests for think_tank.runner (with stubbed Anthropic clients)."""
+
+import asyncio
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+from anthropic import RateLimitError
+
+from think_tank import runner as runner_module
+from think_tank.memory import MemoryManager
+from think_tank.runner import DebateRunner
+from think_tank.schemas import DebateSpec, Expert, Panel, RoundSpec
+
+
+class FakeStream:
+    def __init__(self, owner, text, usage):
+        self._owner = owner
+        self._chunks = [text[i:i + 16] for i in range(0, len(text), 16)]
+        self._message = SimpleNamespace(usage=usage)
+
+    async def __aenter__(self):
+        owner = self._owner
+        owner.active += 1
+        owner.max_active = max(owner.max_active, owner.active)
+        await asyncio.sleep(owner.delay)
+        owner.active -= 1
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self._chunks:
+            yield chunk
+
+    async def get_final_message(self):
+        return self._message
+
+
+class FakeMessages:
+    """Stands in for client.messages; records prompts and returns canned JSON."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def stream(self, **kwargs):
+        self.calls.append(kwargs)
+        n = len(self.calls)
+        body = {
+            "move_type": "claim",
+            "content": f"Analysis {n}",
+            "claims": [{"id": f"C{n}", "text": f"Claim {n}", "confidence": 0.5}],
+        }
+        usage = SimpleNamespace(input_tokens=10, output_tokens=5,
+                                cache_read_input_tokens=100 if n > 1 else 0,
+                                cache_creation_input_tokens=0 if n > 1 else 100)
+        return FakeStream(self, "```json\n" + json.dumps(body) + "\n```", usage)
+
+
+class FakeBatches:
+    """Stands in for client.messages.batches; ends after one poll."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def create(self, requests):
+        self.requests = requests
+        return SimpleNamespace(id="batch_1", processing_status="in_progress")
+
+    async def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+    async def results(self, batch_id):
+        async def entries():
+            # Results come back in arbitrary order
+            for req in reversed(self.requests):
+                body = json.dumps({"content": f"Batched {req['custom_id']}"})
+                message = SimpleNamespace(
+                    content=[SimpleNamespace(type="text", text=body)],
+                    usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+                )
+                yield SimpleNamespace(
+                    custom_id=req["custom_id"],
+                    result=SimpleNamespace(type="succeeded", message=message),
+                )
+        return entries()
+
+
+def _runner(tmp_path, rounds, delay=0.0, **kwargs):
+    panel = Panel(name="P", experts=[
+        Expert(id="e1", name="E1", title="T1"),
+        Expert(id="e2", name="E2", title="T2"),
+        Expert(id="e3", name="E3", title="T3"),
+    ])
+    spec = DebateSpec(title="Test Debate", context="Context", rounds=rounds)
+    fake = SimpleNamespace(messages=FakeMessages(delay=delay))
+    runner = DebateRunner(
+        spec=spec, panel=panel, api_key="test-key",
+        output_dir=str(tmp_path / "out"), use_memory=False,
+        client=SimpleNamespace(), async_client=fake, **kwargs,
+    )
+    return runner, fake.messages
+
+
+class TestDebateRunner:
+    def test_run_records_moves_in_order(self, tmp_path):
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q",
+                      agents=["e1", "missing", "e2", "e3"]),
+            RoundSpec(number=2, focus="S", question="Q",
+                      agents=["synthesizer"]),
+        ])
+        state = runner.run()
+
+        assert [m.agent_id for m in state.moves] == [
+            "e1", "e2", "e3", "synthesizer",
+        ]
+        assert [m.move_id for m in state.moves] == [
+            "M001", "M002", "M003", "M004",
+        ]
+        assert state.total_input_tokens == 40
+        assert state.total_cache_read_tokens == 300
+        assert state.total_cache_creation_tokens == 100
+        assert fake.calls[0]["system"][0]["text"] == "Context"
+        assert (tmp_path / "out" / "debate_state.json").exists()
+        move_file = (tmp_path / "out" / "move_02_R1_e2.json").read_text()
+        assert "\n" not in move_file and json.loads(move_file)["move_id"] == "M002"
+        log = (tmp_path / "out" / "moves.jsonl").read_text().splitlines()
+        assert [json.loads(line)["move_id"] for line in log] == [
+            "M001", "M002", "M003", "M004",
+        ]
+        assert state.moves[0].claims[0].text.startswith("Claim")
+
+    def test_move_path_with_braces_in_output_dir(self, tmp_path):
+        runner, _ = _runner(tmp_path / "{x}", [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1"]),
+        ])
+        runner.run()
+        assert (tmp_path / "{x}" / "out" / "move_01_R1_e1.json").exists()
+
+    def test_round_without_valid_agents_is_skipped(self, tmp_path, caplog):
+        caplog.set_level(logging.INFO, logger="think_tank")
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q",
+                      agents=["ghost", "phantom"]),
+            RoundSpec(number=2, focus="S", question="Q", agents=["e1"]),
+        ])
+        state = runner.run()
+        assert len(fake.calls) == 1
+        assert [m.move_id for m in state.moves] == ["M001"]
+        out = caplog.text
+        assert "[SKIP] Not found in panel: ghost, phantom" in out
+        assert "Round 1 complete" not in out
+
+    def test_lessons_extracted_in_background(self, tmp_path):
+        runner, _ = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1"]),
+        ], background_memory=True)
+        reply = '[{"text": "Lesson", "category": "bias"}]'
+        runner.client = SimpleNamespace(messages=SimpleNamespace(
+            create=lambda **kw: SimpleNamespace(
+                content=[SimpleNamespace(text=reply)]),
+        ))
+        runner.memory = MemoryManager(str(tmp_path / "memory"))
+        runner.run()
+
+        runner.memory_future.result(timeout=5)
+        assert [l.text for l in runner.memory.load_lessons()] == ["Lesson"]
+
+    def test_lessons_extracted_before_run_returns_by_default(self, tmp_path):
+        runner, _ = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1"]),
+        ])
+        reply = '[{"text": "Lesson", "category": "bias"}]'
+        runner.client = SimpleNamespace(messages=SimpleNamespace(
+            create=lambda **kw: SimpleNamespace(
+                content=[SimpleNamespace(text=reply)]),
+        ))
+        runner.memory = MemoryManager(str(tmp_path / "memory"))
+        runner.run()
+
+        assert runner.memory_future.done()
+        assert [l.text for l in runner.memory.load_lessons()] == ["Lesson"]
+        assert not list((tmp_path / "memory").glob("*.tmp"))
+
+    def test_moves_saved_as_they_arrive(self, tmp_path):
+        runner, _ = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1", "e2"]),
+        ])
+        log = tmp_path / "out" / "moves.jsonl"
+        seen = []
+
+        class Slow(FakeMessages):
+            def stream(self, **kwargs):
+                stream = super().stream(**kwargs)
+                final = stream.get_final_message
+
+                async def get_final_message():
+                    seen.append(log.read_text())
+                    return await final()
+
+                stream.get_final_message = get_final_message
+                return stream
+
+        runner.agents["e2"].async_client = SimpleNamespace(
+            messages=Slow(delay=0.05))
+        runner.run()
+        # e1's move was on disk while e2's call was still in flight
+        assert '"M001"' in seen[0]
+
+    def test_bad_depends_on_fails_before_output(self, tmp_path):
+        with pytest.raises(ValueError, match="unknown"):
+            _runner(tmp_path, [
+                RoundSpec(number=1, focus="F", question="Q", agents=["e1"],
+                          depends_on=[7]),
+            ])
+        assert not (tmp_path / "out").exists()
+
+    def test_max_concurrency_must_be_positive(self, tmp_path):
+        with pytest.raises(ValueError, match="max_concurrency"):
+            _runner(tmp_path, [], max_concurrency=0)
+
+    def test_agents_share_clients(self, tmp_path):
+        runner, _ = _runner(tmp_path, [])
+        agents = runner.agents.values()
+        assert {id(a.client) for a in agents} == {id(runner.client)}
+        assert {id(a.async_client) for a in agents} == {id(runner.async_client)}
+
+    def test_round_agents_run_concurrently(self, tmp_path):
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q",
+                      agents=["e1", "e2", "e3"]),
+        ], delay=0.05)
+        runner.run()
+        assert fake.max_active == 3
+
+    def test_sequential_round_chains_moves(self, tmp_path):
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q",
+                      agents=["e1", "e2"], sequential=True),
+        ], delay=0.01)
+        state = runner.run()
+        assert fake.max_active == 1
+        assert [m.move_id for m in state.moves] == ["M001", "M002"]
+        # The second agent sees the first agent's move from this round
+        assert "Analysis 1" in fake.calls[1]["messages"][0]["content"]
+
+    def test_agent_error_becomes_error_move(self, tmp_path):
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1", "e2"]),
+        ])
+
+        def boom(**kwargs):
+            raise RuntimeError("overloaded")
+
+        runner.agents["e1"].async_client = SimpleNamespace(
+            messages=SimpleNamespace(stream=boom))
+        state = runner.run()
+        assert [m.move_type for m in state.moves] == ["error", "claim"]
+        assert "overloaded" in state.moves[0].content
+
+    def test_independent_rounds_run_concurrently(self, tmp_path):
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="A", question="Q", agents=["e1"]),
+            RoundSpec(number=2, focus="B", question="Q", agents=["e2"],
+                      depends_on=[]),
+            RoundSpec(number=3, focus="S", question="Q",
+                      agents=["synthesizer"], depends_on=[1, 2]),
+        ], delay=0.05)
+        state = runner.run()
+        assert fake.max_active == 2
+        assert [m.move_id for m in state.moves] == ["M001", "M002", "M003"]
+        assert [m.round for m in state.moves] == [1, 2, 3]
+        # Round 2 does not see round 1; the synthesizer sees both
+        assert "Analysis" not in fake.calls[1]["messages"][0]["content"]
+        synth_prompt = fake.calls[2]["messages"][0]["content"]
+        assert "(T1)]" in synth_prompt and "(T2)]" in synth_prompt
+
+    def test_overlapped_synthesis_runs_with_last_round(self, tmp_path):
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1"]),
+            RoundSpec(number=2, focus="G", question="Q", agents=["e2", "e3"]),
+            RoundSpec(number=3, focus="S", question="Q",
+                      agents=["synthesizer"]),
+        ], delay=0.05)
+        runner.spec.overlap_synthesis = True
+        state = runner.run()
+        assert fake.max_active == 3
+        staged_prompt = fake.calls[3]["messages"][0]["content"]
+        assert "REQUEST_MORE" in staged_prompt and "(T1)]" in staged_prompt
+        assert [m.move_id for m in state.moves] == [
+            "M001", "M002", "M003", "M004",
+        ]
+
+    def test_no_overlap_without_earlier_moves(self, tmp_path):
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1", "e2"]),
+            RoundSpec(number=2, focus="S", question="Q",
+                      agents=["synthesizer"]),
+        ], delay=0.05)
+        runner.spec.overlap_synthesis = True
+        runner.run()
+        # Staging here would see an empty transcript, so it runs normally
+        assert fake.max_active == 2 and len(fake.calls) == 3
+        assert "REQUEST_MORE" not in fake.calls[2]["messages"][0]["content"]
+
+    def _staged_runner(self, tmp_path, rerun):
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1"]),
+            RoundSpec(number=2, focus="G", question="Q", agents=["e2"]),
+            RoundSpec(number=3, focus="S", question="Q",
+                      agents=["synthesizer"]),
+        ])
+        runner.spec.overlap_synthesis = True
+
+        def staged(**kwargs):
+            if "REQUEST_MORE" in kwargs["messages"][0]["content"]:
+                fake.calls.append(kwargs)
+                usage = SimpleNamespace(input_tokens=7, output_tokens=1)
+                return FakeStream(fake, "REQUEST_MORE", usage)
+            return rerun(**kwargs)
+
+        runner.agents["synthesizer"].async_client = SimpleNamespace(
+            messages=SimpleNamespace(stream=staged))
+        return runner, fake
+
+    def test_overlapped_synthesis_can_request_more(self, tmp_path):
+        runner, fake = self._staged_runner(
+            tmp_path, lambda **kw: fake.stream(**kw))
+        state = runner.run()
+
+        synth = state.moves[-1]
+        assert len(state.moves) == 3 and synth.move_id == "M003"
+        assert not synth.content.startswith("REQUEST_MORE")
+        # The re-run sees round 2 and is billed for both calls
+        assert "(T2)]" in fake.calls[-1]["messages"][0]["content"]
+        assert synth.input_tokens == 17
+
+    def test_failed_rerun_keeps_staged_usage(self, tmp_path):
+        def boom(**kwargs):
+            raise RuntimeError("overloaded")
+
+        runner, _ = self._staged_runner(tmp_path, boom)
+        state = runner.run()
+        synth = state.moves[-1]
+        assert synth.move_type == "error" and synth.input_tokens == 7
+        assert state.total_input_tokens == 27
+        cost = json.loads((tmp_path / "out" / "cost.json").read_text())
+        assert cost["synth_input_tokens"] == 7
+
+    def test_concurrency_is_bounded(self, tmp_path):
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q",
+                      agents=["e1", "e2", "e3"]),
+        ], delay=0.05, max_concurrency=2)
+        runner.run()
+        assert fake.max_active == 2
+
+    def test_rate_limited_move_is_retried(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(runner_module, "RATE_LIMIT_BACKOFF", 0.0)
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1"]),
+        ])
+        failures = [1]
+
+        def throttled(**kwargs):
+            if failures:
+                failures.pop()
+                err = RateLimitError.__new__(RateLimitError)
+                Exception.__init__(err, "429")
+                raise err
+            return fake.stream(**kwargs)
+
+        runner.agents["e1"].async_client = SimpleNamespace(
+            messages=SimpleNamespace(stream=throttled))
+        state = runner.run()
+        assert [m.move_type for m in state.moves] == ["claim"]
+
+    def test_batch_mode_round(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(runner_module, "BATCH_POLL_INITIAL", 0.0)
+        runner, fake = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1", "e2"]),
+            RoundSpec(number=2, focus="S", question="Q",
+                      agents=["synthesizer"]),
+        ], batch_mode=True)
+        fake.batches = FakeBatches()
+        state = runner.run()
+
+        assert [r["custom_id"] for r in fake.batches.requests] == ["M001", "M002"]
+        assert [m.content for m in state.moves[:2]] == [
+            "Batched M001", "Batched M002",
+        ]
+        assert all(m.batched for m in state.moves[:2])
+        # The synthesizer still streams live
+        assert len(fake.calls) == 1 and not state.moves[2].batched
+
+    def test_move_file_write_failure_is_reported(self, tmp_path, monkeypatch,
+                                                 caplog):
+        def fail(path, data):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(runner_module, "_write_bytes", fail)
+        runner, _ = _runner(tmp_path, [
+            RoundSpec(number=1, focus="F", question="Q", agents=["e1"]),
+        ])
+        state = runner.run()
+        assert len(state.moves) == 1
+        assert "[WARN] Could not save move file: disk full" in caplog.text
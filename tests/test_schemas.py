@@ -1,10 +1,13 @@
 """Tests for think_tank.schemas."""
 
 import json
+from dataclasses import fields
+
+import pytest
 
 from think_tank.schemas import (
     Expert, Evidence, Claim, Move, RoundSpec, DebateSpec,
-    Panel, DebateState, Lesson, Forecast, ExpertPerformance,
+    Panel, DebateState, Lesson, Forecast, ExpertPerformance, round_levels,
 )
 
 
@@ -16,7 +19,16 @@ class TestExpert:
 
     def test_display_title(self):
         e = Expert(id="test", name="Dr. Test", title="Testing Expert")
-        assert e.display_title() == "Dr. Test (Testing Expert)"
+        assert e.display_title == "Dr. Test (Testing Expert)"
+
+    def test_frozen(self):
+        e = Expert(id="test", name="Dr. Test", title="Testing Expert")
+        with pytest.raises(AttributeError):
+            e.name = "Other"
+
+    def test_slotted(self):
+        e = Expert(id="test", name="Dr. Test", title="Testing Expert")
+        assert not hasattr(e, "__dict__")
 
     def test_to_dict(self):
         e = Expert(id="test", name="Dr. Test", title="Expert", bias="testing")
@@ -41,6 +53,11 @@ class TestClaim:
         assert d["id"] == "C1"
         assert d["confidence"] == 0.5
         assert isinstance(d["evidence"], list)
+        assert "short" not in d
+
+    def test_short(self):
+        c = Claim(id="C1", text="x" * 400)
+        assert c.short == "x" * 250
 
 
 class TestMove:
@@ -52,6 +69,14 @@ class TestMove:
         assert m.move_id == "M001"
         assert m.round == 1
 
+    def test_preview(self):
+        m = Move(
+            move_id="M001", agent_id="test", agent_title="Test Agent",
+            round=1, content="y" * 2000,
+        )
+        assert m.preview == "y" * 1500
+        assert "preview" not in m.to_dict()
+
     def test_roundtrip(self):
         c = Claim(
             id="C1", text="Claim text", confidence=0.8,
@@ -71,6 +96,24 @@ class TestMove:
         assert m2.claims[0].evidence[0].source == "S1"
         assert m2.input_tokens == 100
 
+    def test_timestamp_serialized_as_iso(self):
+        m = Move(move_id="M1", agent_id="a", agent_title="A", round=1)
+        assert isinstance(m.timestamp, int)
+        iso = m.to_dict()["timestamp"]
+        assert Move.from_dict(m.to_dict()).to_dict()["timestamp"] == iso
+
+        assert Move.from_dict({}).to_dict()["timestamp"] == ""
+        # Loaded values round-trip untouched, offsets and oddities included
+        for ts in ("2026-01-02T03:04:05.678901",
+                   "2026-01-02T03:04:05+05:00", "yesterday"):
+            assert Move.from_dict({"timestamp": ts}).to_dict()["timestamp"] == ts
+
+    def test_slotted(self):
+        m = Move(move_id="M1", agent_id="a", agent_title="A", round=1,
+                 claims=[Claim(id="C1", text="T")])
+        assert not hasattr(m, "__dict__")
+        assert not hasattr(m.claims[0], "__dict__")
+
 
 class TestPanel:
     def test_get_expert(self):
@@ -90,6 +133,13 @@ class TestPanel:
         p = Panel(name="Test", experts=experts)
         assert p.list_ids() == ["x", "y"]
 
+    def test_reassign_experts_resets_index(self):
+        p = Panel(name="Test", experts=[Expert(id="a", name="A", title="A")])
+        assert p.get_expert("a") is not None
+        p.experts = [Expert(id="b", name="B", title="B")]
+        assert p.get_expert("a") is None
+        assert p.get_expert("b").name == "B"
+
 
 class TestDebateState:
     def test_total_claims(self):
@@ -108,6 +158,23 @@ class TestDebateState:
         )
         assert state.total_claims == 3
 
+        state.add_move(Move(move_id="M3", agent_id="a", agent_title="A",
+                            round=2, claims=[Claim(id="C4", text="T4")]))
+        assert state.total_claims == 4
+        assert DebateState.from_dict(state.to_dict()).total_claims == 4
+
+        state.add_moves([m1, m2])
+        assert len(state.moves) == 5 and state.total_claims == 7
+
+        # Direct edits to the public list are picked up too
+        state.moves.append(m2)
+        assert state.total_claims == 8
+        assert state.to_dict()["total_claims"] == 8
+        state.moves = [m1]
+        assert state.total_claims == 2
+        state.moves.pop()
+        assert state.total_claims == 0
+
     def test_roundtrip(self):
         m = Move(
             move_id="M1", agent_id="a", agent_title="A", round=1,
@@ -172,3 +239,42 @@ class TestExpertPerformance:
         p2 = ExpertPerformance.from_dict(d)
         assert p2.expert_id == "test"
         assert p2.total_claims == 15
+
+
+@pytest.mark.parametrize("obj", [
+    Expert(id="e", name="N", title="T"),
+    Evidence(source="S"),
+    Claim(id="C1", text="T"),
+    Move(move_id="M001", agent_id="e", agent_title="T", round=1),
+    RoundSpec(number=1, focus="F", question="Q", agents=["e"]),
+    DebateSpec(title="T", context="C", rounds=[]),
+    Panel(name="P"),
+    Lesson(id="L1", text="T", source_debate="D"),
+    Forecast(id="F1", text="T", probability=0.5, deadline="2026-01-01",
+             source_debate="D"),
+    ExpertPerformance(expert_id="e"),
+], ids=lambda o: type(o).__name__)
+def test_to_dict_covers_every_field(obj):
+    """The hand-written to_dict methods must keep up with new fields."""
+    d = obj.to_dict()
+    expected = [f.name for f in fields(obj) if f.init]
+    assert expected == [k for k in d if k != "brier_score"]
+
+
+class TestRoundLevels:
+    def _rounds(self, *deps):
+        return [RoundSpec(number=i + 1, focus="F", question="Q", agents=[],
+                          depends_on=d) for i, d in enumerate(deps)]
+
+    def test_default_is_one_round_per_level(self):
+        assert round_levels(self._rounds(None, None, None)) == [[0], [1], [2]]
+
+    def test_independent_rounds_share_a_level(self):
+        levels = round_levels(self._rounds(None, [], [1, 2], None))
+        assert levels == [[0, 1], [2], [3]]
+
+    def test_unknown_round_and_cycle_rejected(self):
+        with pytest.raises(ValueError, match="unknown"):
+            round_levels(self._rounds(None, [7]))
+        with pytest.raises(ValueError, match="cycle"):
+            round_levels(self._rounds([2], [1]))
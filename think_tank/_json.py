@@ -0,0 +1,31 @@
+"""JSON helpers that use orjson when it is installed, stdlib json otherwise."""
+
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this regardless of which backend parsed the text.
+JSONDecodeError = json.JSONDecodeError
+
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def dumps(obj, *, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, 2-space indented if requested."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        # Match orjson's compact output
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    return text.encode("utf-8")
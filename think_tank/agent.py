@@ -2,14 +2,121 @@
 
 from __future__ import annotations
 
-import json
+import io
+import logging
+import operator
+import re
 from datetime import datetime
-from typing import List, Optional
+from itertools import islice
+from typing import List, Optional, Sequence
 
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 
+from think_tank import _json
 from think_tank.schemas import Expert, Move, Claim, Evidence, RoundSpec
 
+logger = logging.getLogger(__name__)
+
+# First fenced JSON object in an LLM response (```json ... ``` or bare ```)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# Well-formed claims carry every key; fetch them in one C-level call
+_CLAIM_FIELDS = operator.itemgetter(
+    "id", "text", "confidence", "evidence", "assumptions", "stance",
+)
+_EVIDENCE_FIELDS = operator.itemgetter("source", "quote")
+
+_SYNTHESIZER_SYSTEM_PROMPT = (
+    "You are the DEBATE SYNTHESIZER. Your role is to consolidate "
+    "all prior expert contributions into a unified, actionable "
+    "report. You are neutral, rigorous, and focused on practical "
+    "output. Identify consensus, dissensus, and critical "
+    "uncertainties. Produce structured recommendations."
+)
+
+_DEFAULT_SYNTHESIS_PROMPT = (
+    "Produce the FINAL SYNTHESIS as a comprehensive Markdown document. "
+    "Be concrete — specific recommendations, specific timelines, "
+    "specific evidence. This is the final output."
+)
+
+# Reply that asks for the synthesis to be re-run on the full transcript
+REQUEST_MORE = "REQUEST_MORE"
+
+_STAGED_SYNTHESIS_NOTE = (
+    "\n\nNOTE: This synthesis is running while the previous round is "
+    "still in progress, so more expert contributions may arrive. If the "
+    "moves above are not enough for a sound synthesis, reply with only "
+    f"{REQUEST_MORE} and you will be called again once the round is complete."
+)
+
+
+def staged_synthesis_prompt(synthesizer_prompt: str = "") -> str:
+    """Synthesis instructions for a run that overlaps the previous round."""
+    return (synthesizer_prompt or _DEFAULT_SYNTHESIS_PROMPT) + _STAGED_SYNTHESIS_NOTE
+
+
+def wants_more(move: Move) -> bool:
+    """True if a staged synthesis asked to see the complete round."""
+    return move.content.lstrip().startswith(REQUEST_MORE)
+
+
+# Response format for expert moves; %s is the move id used in claim ids
+_JSON_TEMPLATE = (
+    "Respond with a JSON object containing:\n"
+    "```json\n"
+    "{\n"
+    '  "move_type": "claim" | "object" | "defend",\n'
+    '  "content": "Your main analysis (500-1000 words)",\n'
+    '  "claims": [\n'
+    "    {\n"
+    '      "id": "%s_C1",\n'
+    '      "text": "Specific, falsifiable claim",\n'
+    '      "confidence": 0.0-1.0,\n'
+    '      "evidence": [{"source": "...", "quote": "..."}],\n'
+    '      "assumptions": ["..."],\n'
+    '      "stance": "pro" | "contra" | "neutral"\n'
+    "    }\n"
+    "  ],\n"
+    '  "targets": ["claim_id to challenge, if any"]\n'
+    "}\n"
+    "```\n"
+    "Provide 3-6 claims per move. Be specific and evidence-based."
+)
+
+_EXPERT_RULES = (
+    "\n\nYou are participating in a structured think tank debate. "
+    "RULES:\n"
+    "- Be specific, quantitative, and evidence-based\n"
+    "- Reference real institutions, regulations, and programmes by name\n"
+    "- Challenge prior claims if you disagree, citing evidence\n"
+    "- Provide realistic timelines based on your direct experience\n"
+    "- Distinguish between what is proven and what is aspirational\n"
+    "- When giving estimates, provide ranges, not point values"
+)
+
+
+def format_move(move: Move) -> str:
+    """Transcript fragment for one move, as shown to later agents.
+
+    Built once per move and kept on DebateState.transcript, so prompts
+    join existing fragments instead of re-formatting every prior move.
+    """
+    parts = [
+        f"\n\n## [{move.agent_title}] Round {move.round} — {move.move_type}\n",
+        move.preview,
+    ]
+    for c in move.claims[:4]:
+        parts.append(f"\n  - [{c.confidence:.2f}] {c.short}")
+    return "".join(parts)
+
+
+def _context_text(problem_context: str, memory_context: str) -> str:
+    """Problem context plus lessons from prior debates (static for a run)."""
+    if memory_context:
+        return f"{problem_context}\n\n# LESSONS FROM PRIOR DEBATES\n{memory_context}"
+    return problem_context
+
 
 class DebateAgent:
     """A think tank expert agent that participates in structured debate."""
@@ -20,11 +127,17 @@ class DebateAgent:
         client: Anthropic,
         model: str = "claude-sonnet-4-6",
         is_synthesizer: bool = False,
+        async_client: Optional[AsyncAnthropic] = None,
     ):
         self.expert = expert
         self.client = client
+        self.async_client = async_client
         self.model = model
         self.is_synthesizer = is_synthesizer
+        # The persona never changes, so build the system prompt once
+        self._system_prompt = self._build_system_prompt()
+        # (problem_context, memory_context, blocks) from precompile()
+        self._static: Optional[tuple] = None
 
     @property
     def agent_id(self) -> str:
@@ -34,45 +147,150 @@ class DebateAgent:
         self,
         round_spec: RoundSpec,
         problem_context: str,
-        prior_moves: List[Move],
+        prior_transcript: Sequence[str],
         move_id: str,
         memory_context: str = "",
         synthesizer_prompt: str = "",
     ) -> Move:
         """Generate a debate contribution with structured claims."""
 
-        system_prompt = self._build_system_prompt()
-        user_prompt = self._build_user_prompt(
-            round_spec, problem_context, prior_moves, move_id,
+        request = self._build_request(
+            round_spec, problem_context, prior_transcript, move_id,
             memory_context, synthesizer_prompt,
         )
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            temperature=0.4,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_prompt}],
+        # Stream the reply so the 6000-token generation is consumed as it
+        # arrives instead of in one blocking read at the end
+        buf = io.StringIO()
+        with self.client.messages.stream(**request) as stream:
+            for chunk in stream.text_stream:
+                buf.write(chunk)
+            response = stream.get_final_message()
+
+        return self._finish_move(
+            buf.getvalue(), response.usage, move_id, round_spec.number,
+        )
+
+    async def amake_move(
+        self,
+        round_spec: RoundSpec,
+        problem_context: str,
+        prior_transcript: Sequence[str],
+        move_id: str,
+        memory_context: str = "",
+        synthesizer_prompt: str = "",
+    ) -> Move:
+        """Async variant of make_move, using the agent's async client."""
+
+        request = self._build_request(
+            round_spec, problem_context, prior_transcript, move_id,
+            memory_context, synthesizer_prompt,
+        )
+
+        buf = io.StringIO()
+        async with self.async_client.messages.stream(**request) as stream:
+            async for chunk in stream.text_stream:
+                buf.write(chunk)
+            response = await stream.get_final_message()
+
+        return self._finish_move(
+            buf.getvalue(), response.usage, move_id, round_spec.number,
+        )
+
+    def batch_request(
+        self,
+        round_spec: RoundSpec,
+        problem_context: str,
+        prior_transcript: Sequence[str],
+        move_id: str,
+        memory_context: str = "",
+        synthesizer_prompt: str = "",
+    ) -> dict:
+        """Message Batches API request for this move, keyed by move id."""
+        return {
+            "custom_id": move_id,
+            "params": self._build_request(
+                round_spec, problem_context, prior_transcript, move_id,
+                memory_context, synthesizer_prompt,
+            ),
+        }
+
+    def move_from_message(self, message, move_id: str, round_num: int) -> Move:
+        """Build a Move from a complete (non-streamed) API message."""
+        text = "".join(b.text for b in message.content if b.type == "text")
+        return self._finish_move(text, message.usage, move_id, round_num)
+
+    def _build_request(
+        self,
+        round_spec: RoundSpec,
+        problem_context: str,
+        prior_transcript: Sequence[str],
+        move_id: str,
+        memory_context: str,
+        synthesizer_prompt: str,
+    ) -> dict:
+        user_prompt = self._build_user_prompt(
+            round_spec, prior_transcript, move_id, synthesizer_prompt,
+        )
+        return {
+            "model": self.model,
+            "max_tokens": 6000,
+            "temperature": 0.4,
+            "system": self._system_blocks(problem_context, memory_context),
+            "messages": [{"role": "user", "content": user_prompt}],
+        }
+
+    def precompile(self, problem_context: str, memory_context: str = "") -> None:
+        """Render the system blocks for a run's static context up front.
+
+        Requests with the same context reuse these blocks as-is, so per-move
+        work is only the user prompt and the cached prefix is byte-identical
+        across every call.
+        """
+        self._static = (
+            problem_context, memory_context,
+            self._system_blocks(problem_context, memory_context),
         )
 
-        text = response.content[0].text
-        input_tokens = response.usage.input_tokens
-        output_tokens = response.usage.output_tokens
+    def _system_blocks(self, problem_context: str, memory_context: str) -> List[dict]:
+        """System prompt blocks: shared debate context first, then the persona.
+
+        The context block is identical for every agent in a run and is marked
+        for prompt caching, so all calls share one cached prefix. The persona
+        and the growing transcript come after it and never invalidate it.
+        """
+        static = self._static
+        if (static is not None and static[0] == problem_context
+                and static[1] == memory_context):
+            return static[2]
+
+        blocks = []
+        context = _context_text(problem_context, memory_context)
+        if context:
+            blocks.append({
+                "type": "text",
+                "text": context,
+                "cache_control": {"type": "ephemeral"},
+            })
+        blocks.append({"type": "text", "text": self._system_prompt})
+        return blocks
 
-        move = self._parse_response(text, move_id, round_spec.number)
-        move.input_tokens = input_tokens
-        move.output_tokens = output_tokens
+    def _finish_move(self, text: str, usage, move_id: str, round_num: int) -> Move:
+        move = self._parse_response(text, move_id, round_num)
+        move.input_tokens = usage.input_tokens
+        move.output_tokens = usage.output_tokens
+        # Absent (or None) when the request did not touch the prompt cache
+        move.cache_read_input_tokens = (
+            getattr(usage, "cache_read_input_tokens", 0) or 0
+        )
+        move.cache_creation_input_tokens = (
+            getattr(usage, "cache_creation_input_tokens", 0) or 0
+        )
         return move
 
     def _build_system_prompt(self) -> str:
         if self.is_synthesizer:
-            return (
-                "You are the DEBATE SYNTHESIZER. Your role is to consolidate "
-                "all prior expert contributions into a unified, actionable "
-                "report. You are neutral, rigorous, and focused on practical "
-                "output. Identify consensus, dissensus, and critical "
-                "uncertainties. Produce structured recommendations."
-            )
+            return _SYNTHESIZER_SYSTEM_PROMPT
 
         e = self.expert
         parts = [f"You are {e.name}, {e.title}."]
@@ -84,83 +302,39 @@ class DebateAgent:
         if e.lens:
             parts.append(f"\nYour critical lens: {e.lens}")
 
-        parts.append(
-            "\n\nYou are participating in a structured think tank debate. "
-            "RULES:\n"
-            "- Be specific, quantitative, and evidence-based\n"
-            "- Reference real institutions, regulations, and programmes by name\n"
-            "- Challenge prior claims if you disagree, citing evidence\n"
-            "- Provide realistic timelines based on your direct experience\n"
-            "- Distinguish between what is proven and what is aspirational\n"
-            "- When giving estimates, provide ranges, not point values"
-        )
+        parts.append(_EXPERT_RULES)
 
         return "\n".join(parts)
 
     def _build_user_prompt(
         self,
         round_spec: RoundSpec,
-        problem_context: str,
-        prior_moves: List[Move],
+        prior_transcript: Sequence[str],
         move_id: str,
-        memory_context: str = "",
         synthesizer_prompt: str = "",
     ) -> str:
-        parts = [problem_context]
-
-        # Inject memory context (lessons from prior debates)
-        if memory_context:
-            parts.append(f"\n# LESSONS FROM PRIOR DEBATES\n{memory_context}")
+        buf = io.StringIO()
+        w = buf.write
 
         # Prior debate moves
-        if prior_moves:
-            parts.append("\n# PRIOR DEBATE MOVES\n")
-            limit = len(prior_moves) if self.is_synthesizer else 6
-            for m in prior_moves[-limit:]:
-                parts.append(
-                    f"\n## [{m.agent_title}] Round {m.round} — {m.move_type}"
-                )
-                parts.append(m.content[:1500])
-                if m.claims:
-                    for c in m.claims[:4]:
-                        parts.append(
-                            f"  - [{c.confidence:.2f}] {c.text[:250]}"
-                        )
-
-        parts.append(f"\n# ROUND {round_spec.number}: {round_spec.focus}\n")
-        parts.append(f"**Question**: {round_spec.question}\n")
+        if prior_transcript:
+            w("# PRIOR DEBATE MOVES\n")
+            # Experts see the last 6 moves, the synthesizer sees all of them
+            start = 0 if self.is_synthesizer else max(0, len(prior_transcript) - 6)
+            for fragment in islice(prior_transcript, start, None):
+                w(fragment)
+
+        if prior_transcript:
+            w("\n\n")
+        w(f"# ROUND {round_spec.number}: {round_spec.focus}\n")
+        w(f"\n**Question**: {round_spec.question}\n\n")
 
         if self.is_synthesizer:
-            prompt = synthesizer_prompt or (
-                "Produce the FINAL SYNTHESIS as a comprehensive Markdown document. "
-                "Be concrete — specific recommendations, specific timelines, "
-                "specific evidence. This is the final output."
-            )
-            parts.append(prompt)
+            w(synthesizer_prompt or _DEFAULT_SYNTHESIS_PROMPT)
         else:
-            parts.append(
-                "Respond with a JSON object containing:\n"
-                "```json\n"
-                "{\n"
-                '  "move_type": "claim" | "object" | "defend",\n'
-                '  "content": "Your main analysis (500-1000 words)",\n'
-                '  "claims": [\n'
-                "    {\n"
-                f'      "id": "{move_id}_C1",\n'
-                '      "text": "Specific, falsifiable claim",\n'
-                '      "confidence": 0.0-1.0,\n'
-                '      "evidence": [{"source": "...", "quote": "..."}],\n'
-                '      "assumptions": ["..."],\n'
-                '      "stance": "pro" | "contra" | "neutral"\n'
-                "    }\n"
-                "  ],\n"
-                '  "targets": ["claim_id to challenge, if any"]\n'
-                "}\n"
-                "```\n"
-                "Provide 3-6 claims per move. Be specific and evidence-based."
-            )
+            w(_JSON_TEMPLATE % move_id)
 
-        return "\n".join(parts)
+        return buf.getvalue()
 
     def _parse_response(self, text: str, move_id: str, round_num: int) -> Move:
         """Parse agent response into a structured Move."""
@@ -175,39 +349,26 @@ class DebateAgent:
                 content=text,
             )
 
-        # Try to parse JSON from response
+        m = _FENCE_RE.search(text)
+        json_text = m.group(1) if m else text.strip()
+
+        # Only hand plausible JSON objects to the parser; plain prose would
+        # just raise and unwind a decode error
+        if not (json_text[:1] == "{" and json_text[-1:] == "}"):
+            logger.warning(
+                "    [WARN] No JSON object in response from %s", self.agent_id
+            )
+            return self._text_move(text, move_id, round_num)
+
         try:
-            json_text = text
-            if "```json" in text:
-                start = text.index("```json") + 7
-                end = text.index("```", start)
-                json_text = text[start:end].strip()
-            elif "```" in text:
-                start = text.index("```") + 3
-                end = text.index("```", start)
-                json_text = text[start:end].strip()
-
-            data = json.loads(json_text)
-
-            claims = []
-            for c in data.get("claims", []):
-                evidence = [
-                    Evidence(source=e.get("source", ""), quote=e.get("quote", ""))
-                    for e in c.get("evidence", [])
-                ]
-                claims.append(Claim(
-                    id=c.get("id", ""),
-                    text=c.get("text", ""),
-                    confidence=float(c.get("confidence", 0.7)),
-                    evidence=evidence,
-                    assumptions=c.get("assumptions", []),
-                    stance=c.get("stance", "neutral"),
-                ))
+            data = _json.loads(json_text)
+
+            claims = [_claim_from_dict(c) for c in data.get("claims", [])]
 
             return Move(
                 move_id=move_id,
                 agent_id=self.agent_id,
-                agent_title=self.expert.display_title(),
+                agent_title=self.expert.display_title,
                 round=round_num,
                 move_type=data.get("move_type", "claim"),
                 content=data.get("content", text[:2000]),
@@ -215,13 +376,48 @@ class DebateAgent:
                 targets=data.get("targets", []),
             )
 
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
-            print(f"    [WARN] JSON parse failed for {self.agent_id}: {e}")
-            return Move(
-                move_id=move_id,
-                agent_id=self.agent_id,
-                agent_title=self.expert.display_title(),
-                round=round_num,
-                move_type="claim",
-                content=text[:3000],
+        except (_json.JSONDecodeError, ValueError, KeyError) as e:
+            logger.warning(
+                "    [WARN] JSON parse failed for %s: %s", self.agent_id, e
             )
+            return self._text_move(text, move_id, round_num)
+
+    def _text_move(self, text: str, move_id: str, round_num: int) -> Move:
+        """Fallback move carrying the raw response when no JSON was usable."""
+        return Move(
+            move_id=move_id,
+            agent_id=self.agent_id,
+            agent_title=self.expert.display_title,
+            round=round_num,
+            move_type="claim",
+            content=text[:3000],
+        )
+
+
+def _evidence_from_dict(e: dict) -> Evidence:
+    try:
+        source, quote = _EVIDENCE_FIELDS(e)
+    except KeyError:
+        source, quote = e.get("source", ""), e.get("quote", "")
+    return Evidence(source=source, quote=quote)
+
+
+def _claim_from_dict(c: dict) -> Claim:
+    """Build a Claim from parsed JSON, defaulting any missing keys."""
+    try:
+        cid, text, confidence, evidence, assumptions, stance = _CLAIM_FIELDS(c)
+    except KeyError:
+        cid = c.get("id", "")
+        text = c.get("text", "")
+        confidence = c.get("confidence", 0.7)
+        evidence = c.get("evidence", [])
+        assumptions = c.get("assumptions", [])
+        stance = c.get("stance", "neutral")
+    return Claim(
+        id=cid,
+        text=text,
+        confidence=float(confidence),
+        evidence=[_evidence_from_dict(e) for e in evidence],
+        assumptions=assumptions,
+        stance=stance,
+    )
@@ -2,35 +2,36 @@
 
 from __future__ import annotations
 
-import argparse
-import json
 import os
 import sys
 
+from think_tank import __version__
+
+DESCRIPTION = "LLM-powered multi-expert structured debate tool"
+
 
 def cmd_run(args):
     """Run a debate."""
-    from think_tank.loader import load_panel, load_spec, validate_spec_against_panel
-    from think_tank.runner import DebateRunner
+    from think_tank.loader import (
+        load_panel, load_panel_header, load_spec, validate_spec_against_panel,
+    )
     from think_tank.cost import estimate_cost
 
-    spec = load_spec(args.spec)
-    panel = load_panel(args.panel)
-
-    # Validate
-    warnings = validate_spec_against_panel(spec, panel)
-    for w in warnings:
-        print(f"[WARN] {w}")
-
-    api_key = args.api_key or os.environ.get("ANTHROPIC_API_KEY")
+    try:
+        spec = load_spec(args.spec)
+    except ValueError as e:
+        print(f"ERROR: Invalid spec: {e}")
+        sys.exit(1)
 
-    # Dry run — just show cost estimate
+    # Dry run — just show cost estimate. The estimate only needs the spec,
+    # so read the panel's name without parsing or validating its experts.
     if args.dry_run:
+        panel_name, _ = load_panel_header(args.panel)
         est = estimate_cost(spec, args.model, args.synth_model)
         print(f"\n{'=' * 60}")
         print(f"DRY RUN: {spec.title}")
         print(f"{'=' * 60}")
-        print(f"Panel: {panel.name} ({len(panel.experts)} experts)")
+        print(f"Panel: {panel_name}")
         print(f"Rounds: {est['total_rounds']}")
         print(f"API calls: {est['total_api_calls']}")
         print(f"Est. input tokens: {est['estimated_input_tokens']:,}")
@@ -44,10 +45,21 @@ def cmd_run(args):
             print(f"  R{r['round']}: {r['agents']} agents — {r['focus']}{tag}")
         return
 
+    from think_tank.runner import DebateRunner
+
+    panel = load_panel(args.panel)
+
+    # Validate
+    warnings = validate_spec_against_panel(spec, panel)
+    for w in warnings:
+        print(f"[WARN] {w}")
+
+    api_key = args.api_key or os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
         print("ERROR: No API key. Use --api-key or set ANTHROPIC_API_KEY.")
         sys.exit(1)
 
+    _setup_logging()
     runner = DebateRunner(
         spec=spec,
         panel=panel,
@@ -56,19 +68,141 @@ def cmd_run(args):
         synth_model=args.synth_model,
         output_dir=args.output_dir,
         use_memory=not args.no_memory,
+        max_concurrency=args.max_concurrency,
+        batch_mode=args.batch,
+        # The results summary prints before lesson extraction finishes; the
+        # process still waits for extraction (a non-daemon thread) to exit
+        background_memory=True,
     )
     runner.run()
 
 
+def _setup_logging():
+    """Send think_tank progress logs to stdout through a queue.
+
+    Agents log from concurrent tasks and the lesson-extraction thread;
+    records are only enqueued there, and one listener thread formats and
+    writes them. The listener is stopped (and drained) at exit, after
+    background threads have been joined.
+    """
+    import atexit
+    import logging
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, handler)
+
+    log = logging.getLogger("think_tank")
+    log.addHandler(QueueHandler(records))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+    listener.start()
+    atexit.register(listener.stop)
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    import argparse
+
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected a positive integer, got {value!r}"
+        )
+    return n
+
+
+def _listing_cache_path() -> str:
+    cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_root, "think-tank", "listing.json")
+
+
+def _load_listing_cache(path: str) -> dict:
+    import json
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_listing_cache(path: str, cache: dict):
+    """Write the cache atomically; a failed write just means a cold next run."""
+    import json
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _cached_summary(entries: dict, path: str, summarize) -> dict:
+    """Return summarize(path), reusing the cached result while the file's
+    (mtime, size) is unchanged. Updates ``entries`` in place on a miss."""
+    st = os.stat(path)
+    key = [st.st_mtime_ns, st.st_size]
+    abspath = os.path.abspath(path)
+    entry = entries.get(abspath)
+    if isinstance(entry, dict) and entry.get("key") == key:
+        return entry["summary"]
+    summary = summarize(path)
+    entries[abspath] = {"key": key, "summary": summary}
+    return summary
+
+
+def _panel_summary(path: str) -> dict:
+    from think_tank.loader import load_panel
+
+    panel = load_panel(path)
+    return {
+        "name": panel.name,
+        "description": panel.description,
+        "num_experts": len(panel.experts),
+    }
+
+
+def _spec_summary(path: str) -> dict:
+    from think_tank.loader import load_spec
+
+    spec = load_spec(path)
+    return {"title": spec.title, "num_rounds": len(spec.rounds)}
+
+
 def cmd_list(args):
     """List available panels and specs."""
-    from think_tank.loader import discover_files, load_panel, load_spec
+    from think_tank.loader import discover_files
 
     pkg_root = os.path.dirname(os.path.dirname(__file__))
 
     panels_dir = args.panels_dir or os.path.join(pkg_root, "panels")
     specs_dir = args.specs_dir or os.path.join(pkg_root, "specs")
 
+    # Summaries of unchanged files come from an on-disk cache keyed by
+    # (mtime, size), so a warm listing costs one stat per file
+    cache_path = _listing_cache_path()
+    cache = _load_listing_cache(cache_path)
+    panel_entries = cache.setdefault("panels", {})
+    spec_entries = cache.setdefault("specs", {})
+    before = (dict(panel_entries), dict(spec_entries))
+
     print(f"\n{'=' * 60}")
     print("AVAILABLE PANELS")
     print(f"{'=' * 60}")
@@ -76,10 +210,10 @@ def cmd_list(args):
     if panels:
         for path, stem in panels:
             try:
-                panel = load_panel(path)
-                print(f"  {stem}: {panel.name} ({len(panel.experts)} experts)")
-                if panel.description:
-                    print(f"    {panel.description[:80]}")
+                panel = _cached_summary(panel_entries, path, _panel_summary)
+                print(f"  {stem}: {panel['name']} ({panel['num_experts']} experts)")
+                if panel["description"]:
+                    print(f"    {panel['description'][:80]}")
             except Exception as e:
                 print(f"  {stem}: [ERROR] {e}")
     else:
@@ -92,8 +226,8 @@ def cmd_list(args):
     if specs:
         for path, stem in specs:
             try:
-                spec = load_spec(path)
-                print(f"  {stem}: {spec.title} ({len(spec.rounds)} rounds)")
+                spec = _cached_summary(spec_entries, path, _spec_summary)
+                print(f"  {stem}: {spec['title']} ({spec['num_rounds']} rounds)")
             except Exception as e:
                 print(f"  {stem}: [ERROR] {e}")
     else:
@@ -101,6 +235,9 @@ def cmd_list(args):
 
     print()
 
+    if (panel_entries, spec_entries) != before:
+        _save_listing_cache(cache_path, cache)
+
 
 def cmd_check_forecasts(args):
     """Check forecast tracking status."""
@@ -114,6 +251,8 @@ def cmd_check_forecasts(args):
 
 def cmd_replay(args):
     """Replay a completed debate from its state file."""
+    import json
+
     from think_tank.schemas import DebateState
     from think_tank.cost import compute_actual_cost
 
@@ -122,32 +261,38 @@ def cmd_replay(args):
 
     state = DebateState.from_dict(data)
 
-    print(f"\n{'=' * 60}")
-    print(f"REPLAY: {state.spec_title}")
-    print(f"{'=' * 60}")
-    print(f"Panel: {state.panel_name} ({state.num_experts} experts)")
-    print(f"Rounds: {state.num_rounds}")
-    print(f"Moves: {len(state.moves)}")
-    print(f"Claims: {state.total_claims}")
-    print(f"Started: {state.started_at}")
-    print(f"Finished: {state.finished_at}")
+    # Collect the whole replay and write it once instead of print per line
+    lines = []
+    out = lines.append
+
+    out(f"\n{'=' * 60}")
+    out(f"REPLAY: {state.spec_title}")
+    out(f"{'=' * 60}")
+    out(f"Panel: {state.panel_name} ({state.num_experts} experts)")
+    out(f"Rounds: {state.num_rounds}")
+    out(f"Moves: {len(state.moves)}")
+    out(f"Claims: {state.total_claims}")
+    out(f"Started: {state.started_at}")
+    out(f"Finished: {state.finished_at}")
 
     cost = compute_actual_cost(state)
-    print(f"Cost: ${cost['total_cost_usd']:.4f}\n")
+    out(f"Cost: ${cost['total_cost_usd']:.4f}\n")
 
     current_round = 0
     for move in state.moves:
         if move.round != current_round:
             current_round = move.round
-            print(f"\n--- Round {current_round} ---\n")
+            out(f"\n--- Round {current_round} ---\n")
 
-        print(f"[{move.agent_title}] ({move.move_type})")
-        print(f"  {move.content[:200]}...")
+        out(f"[{move.agent_title}] ({move.move_type})")
+        out(f"  {move.content[:200]}...")
         if move.claims:
-            print(f"  Claims: {len(move.claims)}")
+            out(f"  Claims: {len(move.claims)}")
             for c in move.claims[:3]:
-                print(f"    [{c.confidence:.2f}] {c.text[:100]}")
-        print()
+                out(f"    [{c.confidence:.2f}] {c.text[:100]}")
+        out("")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_resolve(args):
@@ -164,52 +309,107 @@ def cmd_resolve(args):
     print(mm.check_forecasts())
 
 
+def _add_run_args(p):
+    p.add_argument("--spec", required=True, help="Path to debate spec YAML")
+    p.add_argument("--panel", required=True, help="Path to expert panel YAML")
+    p.add_argument("--api-key", default=None,
+                   help="Anthropic API key (or ANTHROPIC_API_KEY env)")
+    p.add_argument("--model", default="claude-sonnet-4-6",
+                   help="Model for agents (default: claude-sonnet-4-6)")
+    p.add_argument("--synth-model", default="claude-opus-4-6",
+                   help="Model for synthesis (default: claude-opus-4-6)")
+    p.add_argument("--output-dir", default=None, help="Output directory")
+    p.add_argument("--dry-run", action="store_true",
+                   help="Estimate cost without running")
+    p.add_argument("--no-memory", action="store_true",
+                   help="Disable self-development memory")
+    p.add_argument("--max-concurrency", type=_positive_int, default=8,
+                   help="Max concurrent agent API calls (default: 8)")
+    p.add_argument("--batch", action="store_true",
+                   help="Submit expert moves via the Message Batches API "
+                        "(half price, slower)")
+
+
+def _add_list_args(p):
+    p.add_argument("--panels-dir", default=None)
+    p.add_argument("--specs-dir", default=None)
+
+
+def _add_check_forecasts_args(p):
+    p.add_argument("--memory-dir", default=None)
+
+
+def _add_replay_args(p):
+    p.add_argument("state_file", help="Path to debate_state.json")
+
+
+def _add_resolve_args(p):
+    p.add_argument("forecast_id", help="Forecast ID to resolve")
+    p.add_argument("outcome", help="Outcome: true/false/yes/no")
+    p.add_argument("--memory-dir", default=None)
+
+
+# name -> (help, argument builder, handler)
+SUBCOMMANDS = {
+    "run": ("Run a debate", _add_run_args, cmd_run),
+    "list": ("List available panels and specs", _add_list_args, cmd_list),
+    "check-forecasts": ("Check forecast tracking",
+                        _add_check_forecasts_args, cmd_check_forecasts),
+    "replay": ("Replay a completed debate", _add_replay_args, cmd_replay),
+    "resolve": ("Resolve a forecast", _add_resolve_args, cmd_resolve),
+}
+
+
+def _sniff_subcommand(argv):
+    """Return the first positional argument (the subcommand), if any."""
+    return next((a for a in argv[1:] if not a.startswith("-")), None)
+
+
+def _print_usage(file=None):
+    """Print top-level usage from SUBCOMMANDS without building a parser."""
+    lines = [
+        f"usage: think-tank [-h] [-v] {{{','.join(SUBCOMMANDS)}}} ...",
+        "",
+        DESCRIPTION,
+        "",
+        "commands:",
+    ]
+    for name, (help_text, _, _) in SUBCOMMANDS.items():
+        lines.append(f"  {name:<18}{help_text}")
+    lines.append("")
+    lines.append("Run 'think-tank <command> --help' for command options.")
+    print("\n".join(lines), file=file or sys.stdout)
+
+
 def main():
-    parser = argparse.ArgumentParser(
-        prog="think-tank",
-        description="LLM-powered multi-expert structured debate tool",
-    )
+    argv = sys.argv
+    # Fast paths: version and top-level help need neither argparse nor any
+    # of the subcommand imports
+    if len(argv) == 2 and argv[1] in ("-v", "--version"):
+        print(f"think-tank {__version__}")
+        return
+    if len(argv) == 2 and argv[1] in ("-h", "--help"):
+        _print_usage()
+        return
+    if len(argv) == 1:
+        _print_usage()
+        sys.exit(1)
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="think-tank", description=DESCRIPTION)
+    parser.add_argument("-v", "--version", action="version",
+                        version=f"think-tank {__version__}")
     sub = parser.add_subparsers(dest="command", help="Available commands")
 
-    # ── run ──
-    p_run = sub.add_parser("run", help="Run a debate")
-    p_run.add_argument("--spec", required=True, help="Path to debate spec YAML")
-    p_run.add_argument("--panel", required=True, help="Path to expert panel YAML")
-    p_run.add_argument("--api-key", default=None,
-                       help="Anthropic API key (or ANTHROPIC_API_KEY env)")
-    p_run.add_argument("--model", default="claude-sonnet-4-6",
-                       help="Model for agents (default: claude-sonnet-4-6)")
-    p_run.add_argument("--synth-model", default="claude-opus-4-6",
-                       help="Model for synthesis (default: claude-opus-4-6)")
-    p_run.add_argument("--output-dir", default=None, help="Output directory")
-    p_run.add_argument("--dry-run", action="store_true",
-                       help="Estimate cost without running")
-    p_run.add_argument("--no-memory", action="store_true",
-                       help="Disable self-development memory")
-    p_run.set_defaults(func=cmd_run)
-
-    # ── list ──
-    p_list = sub.add_parser("list", help="List available panels and specs")
-    p_list.add_argument("--panels-dir", default=None)
-    p_list.add_argument("--specs-dir", default=None)
-    p_list.set_defaults(func=cmd_list)
-
-    # ── check-forecasts ──
-    p_fc = sub.add_parser("check-forecasts", help="Check forecast tracking")
-    p_fc.add_argument("--memory-dir", default=None)
-    p_fc.set_defaults(func=cmd_check_forecasts)
-
-    # ── replay ──
-    p_replay = sub.add_parser("replay", help="Replay a completed debate")
-    p_replay.add_argument("state_file", help="Path to debate_state.json")
-    p_replay.set_defaults(func=cmd_replay)
-
-    # ── resolve ──
-    p_resolve = sub.add_parser("resolve", help="Resolve a forecast")
-    p_resolve.add_argument("forecast_id", help="Forecast ID to resolve")
-    p_resolve.add_argument("outcome", help="Outcome: true/false/yes/no")
-    p_resolve.add_argument("--memory-dir", default=None)
-    p_resolve.set_defaults(func=cmd_resolve)
+    # Every subcommand is registered so top-level --help lists them all, but
+    # only the one actually invoked gets its arguments wired up.
+    cmd = _sniff_subcommand(sys.argv)
+    for name, (help_text, add_args, func) in SUBCOMMANDS.items():
+        p = sub.add_parser(name, help=help_text)
+        p.set_defaults(func=func)
+        if name == cmd:
+            add_args(p)
 
     args = parser.parse_args()
 
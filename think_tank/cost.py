@@ -14,6 +14,17 @@ MODEL_PRICING: Dict[str, Tuple[float, float]] = {
     "claude-haiku-4-5-20251001": (0.80, 4.0),
 }
 
+# Fallback (input_per_M, output_per_M) for models missing from MODEL_PRICING
+_DEFAULT_MODEL_PRICE = (3.0, 15.0)
+_DEFAULT_SYNTH_PRICE = (15.0, 75.0)
+
+# Prompt-cache pricing relative to the base input price
+CACHE_READ_MULTIPLIER = 0.1
+CACHE_WRITE_MULTIPLIER = 1.25
+
+# Message Batches API requests are billed at half the standard rates
+BATCH_DISCOUNT = 0.5
+
 # Rough token estimates per component
 AVG_SYSTEM_PROMPT_TOKENS = 300
 AVG_PROBLEM_CONTEXT_TOKENS = 2000
@@ -71,16 +82,16 @@ def estimate_cost(
         })
 
     # Calculate costs
-    model_price = MODEL_PRICING.get(model, (3.0, 15.0))
-    synth_price = MODEL_PRICING.get(synth_model, (15.0, 75.0))
+    in_p, out_p = MODEL_PRICING.get(model, _DEFAULT_MODEL_PRICE)
+    synth_in_p, synth_out_p = MODEL_PRICING.get(synth_model, _DEFAULT_SYNTH_PRICE)
 
     agent_cost = (
-        (total_input / 1_000_000) * model_price[0]
-        + (total_output / 1_000_000) * model_price[1]
+        (total_input / 1_000_000) * in_p
+        + (total_output / 1_000_000) * out_p
     )
     synth_cost = (
-        (total_synth_input / 1_000_000) * synth_price[0]
-        + (total_synth_output / 1_000_000) * synth_price[1]
+        (total_synth_input / 1_000_000) * synth_in_p
+        + (total_synth_output / 1_000_000) * synth_out_p
     )
 
     total_api_calls = sum(len(r.agents) for r in spec.rounds)
@@ -101,29 +112,44 @@ def estimate_cost(
 
 def compute_actual_cost(state: DebateState) -> Dict:
     """Compute actual cost from a completed debate state."""
-    model_price = MODEL_PRICING.get(state.model, (3.0, 15.0))
-    synth_price = MODEL_PRICING.get(state.synth_model, (15.0, 75.0))
-
-    agent_input = 0
-    agent_output = 0
-    synth_input = 0
-    synth_output = 0
+    in_p, out_p = MODEL_PRICING.get(state.model, _DEFAULT_MODEL_PRICE)
+    synth_in_p, synth_out_p = MODEL_PRICING.get(
+        state.synth_model, _DEFAULT_SYNTH_PRICE,
+    )
 
+    # Index 0 accumulates agent moves, index 1 synthesis moves
+    inputs = [0, 0]
+    outputs = [0, 0]
+    cache_reads = [0, 0]
+    cache_writes = [0, 0]
+    # Tokens weighted by what they are billed as: cached prompt tokens count
+    # as discounted (reads) or premium (writes) input, batched moves as half
+    billed_in = [0.0, 0.0]
+    billed_out = [0.0, 0.0]
     for move in state.moves:
-        if move.move_type == "synthesize":
-            synth_input += move.input_tokens
-            synth_output += move.output_tokens
-        else:
-            agent_input += move.input_tokens
-            agent_output += move.output_tokens
+        # A failed synthesis re-run can still carry billed synth tokens
+        k = move.move_type == "synthesize" or move.agent_id == "synthesizer"
+        inputs[k] += move.input_tokens
+        outputs[k] += move.output_tokens
+        cache_reads[k] += move.cache_read_input_tokens
+        cache_writes[k] += move.cache_creation_input_tokens
+        rate = BATCH_DISCOUNT if move.batched else 1.0
+        billed_in[k] += rate * (
+            move.input_tokens
+            + move.cache_read_input_tokens * CACHE_READ_MULTIPLIER
+            + move.cache_creation_input_tokens * CACHE_WRITE_MULTIPLIER
+        )
+        billed_out[k] += rate * move.output_tokens
+    agent_input, synth_input = inputs
+    agent_output, synth_output = outputs
 
     agent_cost = (
-        (agent_input / 1_000_000) * model_price[0]
-        + (agent_output / 1_000_000) * model_price[1]
+        (billed_in[0] / 1_000_000) * in_p
+        + (billed_out[0] / 1_000_000) * out_p
     )
     synth_cost = (
-        (synth_input / 1_000_000) * synth_price[0]
-        + (synth_output / 1_000_000) * synth_price[1]
+        (billed_in[1] / 1_000_000) * synth_in_p
+        + (billed_out[1] / 1_000_000) * synth_out_p
     )
 
     return {
@@ -133,6 +159,8 @@ def compute_actual_cost(state: DebateState) -> Dict:
         "agent_output_tokens": agent_output,
         "synth_input_tokens": synth_input,
         "synth_output_tokens": synth_output,
+        "cache_read_tokens": cache_reads[0] + cache_reads[1],
+        "cache_creation_tokens": cache_writes[0] + cache_writes[1],
         "agent_cost_usd": round(agent_cost, 4),
         "synth_cost_usd": round(synth_cost, 4),
         "total_cost_usd": round(agent_cost + synth_cost, 4),
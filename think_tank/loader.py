@@ -2,13 +2,33 @@
 
 from __future__ import annotations
 
+import functools
 import os
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-import yaml
+from think_tank.schemas import (
+    Expert, Panel, RoundSpec, DebateSpec, round_levels,
+)
 
-from think_tank.schemas import Expert, Panel, RoundSpec, DebateSpec
+
+# Repository root; relative panel/spec paths fall back to it
+_PKG_ROOT = Path(__file__).resolve().parent.parent
+
+
+@functools.lru_cache(maxsize=None)
+def _safe_loader():
+    """PyYAML's libyaml-backed loader if available (~10x faster parsing).
+
+    PyYAML is imported on first use so that importing this module (e.g.
+    for discover_files) does not pay for the extension load. Both loaders
+    take binary streams and decode UTF-8 themselves, so files are opened "rb".
+    """
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader as Loader
+    return Loader
 
 
 def _resolve_path(path: str) -> Path:
@@ -19,8 +39,7 @@ def _resolve_path(path: str) -> Path:
     # Try relative to CWD first, then package root
     if p.exists():
         return p
-    pkg_root = Path(__file__).parent.parent
-    candidate = pkg_root / p
+    candidate = _PKG_ROOT / p
     if candidate.exists():
         return candidate
     return p  # Return original, let caller handle missing
@@ -32,12 +51,27 @@ def load_panel(path: str) -> Panel:
     Supports two formats:
     - WW3 format: id, name, role, bias, lens
     - Cluster format: id, name, title, background
+
+    Parsed panels are cached per (path, mtime, size); callers must treat the
+    returned object as read-only.
     """
     p = _resolve_path(path)
-    with open(p, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    st = p.stat()
+    return _load_panel_cached(p.absolute(), st.st_mtime_ns, st.st_size)
+
 
-    panel_name = data.get("name", p.stem)
+@functools.lru_cache(maxsize=64)
+def _load_panel_cached(p: Path, mtime_ns: int, size: int) -> Panel:
+    import yaml
+
+    with open(p, "rb") as f:
+        data = yaml.load(f, Loader=_safe_loader())
+    return _panel_from_dict(data, default_name=p.stem)
+
+
+def _panel_from_dict(data: dict, default_name: str = "") -> Panel:
+    """Build a Panel from already-parsed YAML/JSON data."""
+    panel_name = data.get("name", default_name)
     description = data.get("description", "")
     experts_raw = data.get("experts", [])
 
@@ -57,13 +91,76 @@ def load_panel(path: str) -> Panel:
     return Panel(name=panel_name, description=description, experts=experts)
 
 
+def load_panel_header(path: str) -> Tuple[str, str]:
+    """Return a panel's (name, description) without building its experts.
+
+    Scans the YAML event stream and stops as soon as both top-level keys
+    have been seen, so large panels are not composed into Python objects.
+    Values resolve exactly as load_panel would read them; a header given
+    as an alias or a collection falls back to the full load.
+    """
+    import yaml
+
+    p = _resolve_path(path)
+    loader = _safe_loader()("")
+    header = {}
+    depth = 0
+    key = None  # pending top-level key, None while expecting a key
+
+    with open(p, "rb") as f:
+        for event in yaml.parse(f, Loader=_safe_loader()):
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                if depth == 1:
+                    if key in ("name", "description"):
+                        panel = load_panel(path)
+                        return panel.name, panel.description
+                    key = None  # a nested value; its key is not a header field
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+            elif depth == 1 and isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+                if key is None:
+                    key = event.value if isinstance(event, yaml.ScalarEvent) else ""
+                    continue
+                if key in ("name", "description"):
+                    if isinstance(event, yaml.AliasEvent):
+                        panel = load_panel(path)
+                        return panel.name, panel.description
+                    tag = event.tag
+                    if tag is None or tag == "!":
+                        tag = loader.resolve(
+                            yaml.ScalarNode, event.value, event.implicit)
+                    header[key] = loader.construct_object(
+                        yaml.ScalarNode(tag, event.value, style=event.style))
+                    if len(header) == 2:
+                        break
+                key = None
+
+    return header.get("name", p.stem), header.get("description", "")
+
+
 def load_spec(path: str) -> DebateSpec:
-    """Load a debate specification from a YAML file."""
+    """Load a debate specification from a YAML file.
+
+    Cached like load_panel(); the returned spec is shared between callers.
+    """
     p = _resolve_path(path)
-    with open(p, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    st = p.stat()
+    return _load_spec_cached(p.absolute(), st.st_mtime_ns, st.st_size)
+
 
-    title = data.get("title", p.stem)
+@functools.lru_cache(maxsize=64)
+def _load_spec_cached(p: Path, mtime_ns: int, size: int) -> DebateSpec:
+    import yaml
+
+    with open(p, "rb") as f:
+        data = yaml.load(f, Loader=_safe_loader())
+    return _spec_from_dict(data, default_title=p.stem)
+
+
+def _spec_from_dict(data: dict, default_title: str = "") -> DebateSpec:
+    """Build a DebateSpec from already-parsed YAML/JSON data."""
+    title = data.get("title", default_title)
     context = data.get("context", "")
     synth_prompt = data.get("synthesizer_prompt", "")
 
@@ -74,13 +171,35 @@ def load_spec(path: str) -> DebateSpec:
             focus=r.get("focus", ""),
             question=r.get("question", ""),
             agents=r.get("agents", []),
+            sequential=bool(r.get("sequential", False)),
+            depends_on=_depends_on(r, len(rounds) + 1),
         ))
+    # Reject unknown rounds and cycles at load time, not mid-run
+    round_levels(rounds)
 
     return DebateSpec(
         title=title,
         context=context,
         rounds=rounds,
         synthesizer_prompt=synth_prompt,
+        overlap_synthesis=bool(data.get("overlap_synthesis", False)),
+    )
+
+
+def _depends_on(r: dict, default_number: int) -> Optional[List[int]]:
+    """A round's depends_on as a list; a single round number is accepted."""
+    deps = r.get("depends_on")
+    if deps is None:
+        return None
+    if isinstance(deps, int) and not isinstance(deps, bool):
+        return [deps]
+    if isinstance(deps, list) and all(
+        isinstance(d, int) and not isinstance(d, bool) for d in deps
+    ):
+        return deps
+    raise ValueError(
+        f"Round {r.get('number', default_number)}: depends_on must be a "
+        f"round number or a list of round numbers, got {deps!r}"
     )
 
 
@@ -89,18 +208,23 @@ def validate_spec_against_panel(spec: DebateSpec, panel: Panel) -> List[str]:
 
     Returns a list of warning messages (empty = valid).
     """
-    panel_ids = set(panel.list_ids())
+    panel_ids = frozenset(panel.list_ids())
+    used = frozenset().union(*(rnd.agents for rnd in spec.rounds))
+    missing = used - panel_ids - {"synthesizer"}
     warnings = []
 
-    for rnd in spec.rounds:
-        for agent_id in rnd.agents:
-            if agent_id == "synthesizer":
+    # Only re-scan the rounds to format warnings when something is missing
+    if missing:
+        for rnd in spec.rounds:
+            if missing.isdisjoint(rnd.agents):
                 continue
-            if agent_id not in panel_ids:
-                warnings.append(
-                    f"Round {rnd.number}: agent '{agent_id}' not found in panel "
-                    f"'{panel.name}' (available: {len(panel_ids)} experts)"
-                )
+            for agent_id in rnd.agents:
+                if agent_id in missing:
+                    warnings.append(
+                        f"Round {rnd.number}: agent '{agent_id}' not found in "
+                        f"panel '{panel.name}' (available: {len(panel_ids)} "
+                        f"experts)"
+                    )
 
     return warnings
 
@@ -110,8 +234,13 @@ def discover_files(directory: str, suffix: str = ".yaml") -> List[Tuple[str, str
     d = _resolve_path(directory)
     if not d.is_dir():
         return []
-    results = []
-    for f in sorted(d.iterdir()):
-        if f.suffix in (suffix, ".yml") and not f.name.startswith("_"):
-            results.append((str(f), f.stem))
-    return results
+    # DirEntry caches name and file type, so no Path objects or extra stats
+    with os.scandir(d) as it:
+        entries = [
+            e for e in it
+            if e.name.endswith((suffix, ".yml"))
+            and not e.name.startswith("_")
+            and e.is_file()
+        ]
+    entries.sort(key=lambda e: e.name)
+    return [(e.path, os.path.splitext(e.name)[0]) for e in entries]
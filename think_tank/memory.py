@@ -2,15 +2,69 @@
 
 from __future__ import annotations
 
-import json
+import logging
 import os
+import re
 from datetime import datetime
 from typing import List, Optional
 
+from think_tank import _json
 from think_tank.schemas import (
-    DebateState, Lesson, Forecast, ExpertPerformance,
+    DebateState, Lesson, Forecast, ExpertPerformance, brier_score,
 )
 
+logger = logging.getLogger(__name__)
+
+# First fenced block (```json or bare ```) in a model reply
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+# Characters of debate summary sent to the lesson extractor
+_SUMMARY_BUDGET = 8000
+
+
+def _iter_summary(state: DebateState):
+    """Yield debate summary lines, stopping once the budget is filled."""
+    lines = (
+        f"Debate: {state.spec_title}",
+        f"Panel: {state.panel_name} ({state.num_experts} experts, "
+        f"{state.num_rounds} rounds)",
+        f"Total claims: {state.total_claims}",
+        "",
+    )
+    yield from lines
+    # Running length of the joined text, including newline separators
+    length = sum(map(len, lines)) + len(lines) - 1
+
+    for move in state.moves:
+        if length >= _SUMMARY_BUDGET:
+            return
+        if move.move_type == "synthesize":
+            line = f"[SYNTHESIS] {move.content[:2000]}"
+            yield line
+            length += len(line) + 1
+        elif move.claims:
+            for c in move.claims[:3]:
+                if length >= _SUMMARY_BUDGET:
+                    return
+                line = f"[{move.agent_id}] [{c.confidence:.2f}] {c.text[:200]}"
+                yield line
+                length += len(line) + 1
+
+
+def _write_atomic(path: str, data: bytes):
+    """Replace path with data so readers never see a half-written file."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
 
 class MemoryManager:
     """Manages persistent memory across debate runs."""
@@ -21,6 +75,8 @@ class MemoryManager:
 
         self.lessons_file = os.path.join(memory_dir, "lessons.json")
         self.forecasts_file = os.path.join(memory_dir, "forecasts.json")
+        # Append-only log of new forecasts, folded into forecasts_file on load
+        self.forecasts_log = os.path.join(memory_dir, "forecasts.jsonl")
         self.performance_file = os.path.join(memory_dir, "performance.json")
         self.bootstrap_file = os.path.join(memory_dir, "_bootstrap.json")
 
@@ -43,8 +99,7 @@ class MemoryManager:
     def save_lessons(self, lessons: List[Lesson]):
         """Save lessons to disk (overwrites)."""
         data = [l.to_dict() for l in lessons]
-        with open(self.lessons_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_atomic(self.lessons_file, _json.dumps(data, indent=True))
 
     def load_context(self) -> str:
         """Build a memory context string for injection into agent prompts."""
@@ -65,27 +120,7 @@ class MemoryManager:
     ):
         """Use an LLM to extract lessons from a completed debate."""
 
-        # Build summary of the debate
-        summary_parts = [
-            f"Debate: {state.spec_title}",
-            f"Panel: {state.panel_name} ({state.num_experts} experts, "
-            f"{state.num_rounds} rounds)",
-            f"Total claims: {state.total_claims}",
-            "",
-        ]
-
-        for move in state.moves:
-            if move.move_type == "synthesize":
-                summary_parts.append(
-                    f"[SYNTHESIS] {move.content[:2000]}"
-                )
-            elif move.claims:
-                for c in move.claims[:3]:
-                    summary_parts.append(
-                        f"[{move.agent_id}] [{c.confidence:.2f}] {c.text[:200]}"
-                    )
-
-        summary = "\n".join(summary_parts)
+        summary = "\n".join(_iter_summary(state))[:_SUMMARY_BUDGET]
 
         # LLM call to extract lessons
         prompt = (
@@ -101,7 +136,7 @@ class MemoryManager:
             "- Domain knowledge that should be carried forward\n"
             "- Biases that were identified or that emerged\n"
             "- Process improvements for future debates\n\n"
-            f"DEBATE SUMMARY:\n{summary[:8000]}\n\n"
+            f"DEBATE SUMMARY:\n{summary}\n\n"
             "Respond with a JSON array of lessons."
         )
 
@@ -116,24 +151,19 @@ class MemoryManager:
 
         # Parse lessons
         try:
-            json_text = text
-            if "```json" in text:
-                start = text.index("```json") + 7
-                end = text.index("```", start)
-                json_text = text[start:end].strip()
-            elif "```" in text:
-                start = text.index("```") + 3
-                end = text.index("```", start)
-                json_text = text[start:end].strip()
-
-            raw_lessons = json.loads(json_text)
+            m = _FENCE_RE.search(text)
+            json_text = m.group(1).strip() if m else text
+
+            raw_lessons = _json.loads(json_text)
             if not isinstance(raw_lessons, list):
                 raw_lessons = [raw_lessons]
 
+            # One timestamp per batch; the index keeps generated ids unique
+            ts = datetime.now().strftime("%Y%m%d%H%M%S")
             new_lessons = []
-            for rl in raw_lessons:
+            for i, rl in enumerate(raw_lessons):
                 lesson = Lesson(
-                    id=rl.get("id", f"L_{datetime.now().strftime('%Y%m%d%H%M%S')}"),
+                    id=rl.get("id", f"L_{ts}_{i:02d}"),
                     text=rl.get("text", ""),
                     source_debate=state.spec_title,
                     category=rl.get("category", "methodology"),
@@ -141,71 +171,134 @@ class MemoryManager:
                 )
                 new_lessons.append(lesson)
 
-            # Merge with existing
-            existing = self.load_lessons()
-            # Don't load bootstrap again — load_lessons already includes them
-            existing_from_file = (
-                self._load_json_list(self.lessons_file, Lesson)
-                if os.path.exists(self.lessons_file)
-                else []
-            )
-            existing_from_file.extend(new_lessons)
-            self.save_lessons(existing_from_file)
+            # Append to the stored records as-is; bootstrap lessons live in
+            # their own file and are never copied into lessons.json
+            raw = []
+            if os.path.exists(self.lessons_file):
+                with open(self.lessons_file, "rb") as f:
+                    raw = _json.loads(f.read())
+                if not isinstance(raw, list):
+                    raw = []
+            raw.extend(l.to_dict() for l in new_lessons)
+            _write_atomic(self.lessons_file, _json.dumps(raw, indent=True))
 
-            print(f"  Extracted {len(new_lessons)} lessons")
+            logger.info("  Extracted %d lessons", len(new_lessons))
 
-        except (json.JSONDecodeError, ValueError) as e:
-            print(f"  [WARN] Lesson parsing failed: {e}")
+        except (_json.JSONDecodeError, ValueError) as e:
+            logger.warning("  [WARN] Lesson parsing failed: %s", e)
 
     # ── Forecasts ──────────────────────────────────────────
 
     def load_forecasts(self) -> List[Forecast]:
-        if not os.path.exists(self.forecasts_file):
-            return []
-        return self._load_json_list(self.forecasts_file, Forecast)
+        return [Forecast.from_dict(d) for d in self._load_forecasts_raw()]
 
     def save_forecasts(self, forecasts: List[Forecast]):
-        data = [f.to_dict() for f in forecasts]
-        with open(self.forecasts_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._save_forecasts_raw([f.to_dict() for f in forecasts])
 
     def add_forecast(self, forecast: Forecast):
-        forecasts = self.load_forecasts()
-        forecasts.append(forecast)
-        self.save_forecasts(forecasts)
+        """Record a forecast with a single O(1) append to the forecast log."""
+        line = _json.dumps(forecast.to_dict()) + b"\n"
+        with open(self.forecasts_log, "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
 
     def resolve_forecast(self, forecast_id: str, outcome: bool):
-        """Resolve a forecast and compute its Brier score."""
-        forecasts = self.load_forecasts()
-        for f in forecasts:
-            if f.id == forecast_id:
-                f.resolved = True
-                f.outcome = outcome
-                f.resolved_at = datetime.now().isoformat()
+        """Resolve a forecast and compute its Brier score.
+
+        Edits the stored records in place rather than round-tripping every
+        forecast through the dataclass.
+        """
+        data = self._load_forecasts_raw()
+        for d in data:
+            if d.get("id") == forecast_id:
+                d["resolved"] = True
+                d["outcome"] = outcome
+                d["resolved_at"] = datetime.now().isoformat()
+                d["brier_score"] = brier_score(d.get("probability", 0.0), outcome)
                 break
-        self.save_forecasts(forecasts)
+        self._save_forecasts_raw(data)
+
+    def _load_forecasts_raw(self) -> List[dict]:
+        """Load forecast records, compacting any pending log entries.
+
+        Log entries override canonical records with the same id. The merged
+        list is written back to forecasts.json before the log is truncated,
+        so an interrupted compaction is simply redone on the next load.
+        """
+        data = []
+        if os.path.exists(self.forecasts_file):
+            with open(self.forecasts_file, "rb") as f:
+                data = _json.loads(f.read())
+            if not isinstance(data, list):
+                data = []
+
+        pending = self._read_forecast_log()
+        if pending:
+            index = {d.get("id"): i for i, d in enumerate(data)}
+            for d in pending:
+                i = index.get(d.get("id"))
+                if i is None:
+                    index[d.get("id")] = len(data)
+                    data.append(d)
+                else:
+                    data[i] = d
+            self._save_forecasts_raw(data)
+            open(self.forecasts_log, "w").close()
+
+        return data
+
+    def _read_forecast_log(self) -> List[dict]:
+        if not os.path.exists(self.forecasts_log):
+            return []
+        entries = []
+        with open(self.forecasts_log, "rb") as f:
+            for line in f:
+                try:
+                    entries.append(_json.loads(line))
+                except ValueError:
+                    continue  # torn write from an interrupted append
+        return entries
+
+    def _save_forecasts_raw(self, data: List[dict]):
+        _write_atomic(self.forecasts_file, _json.dumps(data, indent=True))
 
     def check_forecasts(self) -> str:
-        """Return a formatted report of all forecasts and their scores."""
-        forecasts = self.load_forecasts()
+        """Return a formatted report of all forecasts and their scores.
+
+        Reads the stored records directly; the report never needs Forecast
+        instances.
+        """
+        forecasts = self._load_forecasts_raw()
         if not forecasts:
             return "No forecasts recorded."
 
         lines = ["# Forecast Tracker\n"]
-        resolved = [f for f in forecasts if f.resolved]
-        pending = [f for f in forecasts if not f.resolved]
+        resolved = []
+        pending = []
+        for f in forecasts:
+            if not f.get("resolved", False):
+                pending.append(f)
+                continue
+            # Same rule as Forecast.brier_score: only scored once an outcome exists
+            outcome = f.get("outcome")
+            score = (
+                brier_score(f["probability"], outcome)
+                if outcome is not None else None
+            )
+            resolved.append((f, score))
 
         if resolved:
-            scores = [f.brier_score for f in resolved if f.brier_score is not None]
+            scores = [score for _, score in resolved if score is not None]
             avg_brier = sum(scores) / len(scores) if scores else 0.0
             lines.append(f"## Resolved ({len(resolved)})")
             lines.append(f"**Average Brier Score**: {avg_brier:.4f} "
                          f"(0 = perfect, 1 = worst)\n")
-            for f in resolved:
-                outcome_str = "YES" if f.outcome else "NO"
+            for f, score in resolved:
+                outcome_str = "YES" if f.get("outcome") else "NO"
                 lines.append(
-                    f"- [{f.brier_score:.4f}] {f.text} "
-                    f"(predicted {f.probability:.0%}, actual: {outcome_str})"
+                    f"- [{score:.4f}] {f['text']} "
+                    f"(predicted {f['probability']:.0%}, actual: {outcome_str})"
                 )
             lines.append("")
 
@@ -213,8 +306,8 @@ class MemoryManager:
             lines.append(f"## Pending ({len(pending)})")
             for f in pending:
                 lines.append(
-                    f"- {f.text} (predicted {f.probability:.0%}, "
-                    f"deadline: {f.deadline})"
+                    f"- {f['text']} (predicted {f['probability']:.0%}, "
+                    f"deadline: {f['deadline']})"
                 )
 
         return "\n".join(lines)
@@ -224,55 +317,64 @@ class MemoryManager:
     def load_performance(self) -> dict[str, ExpertPerformance]:
         if not os.path.exists(self.performance_file):
             return {}
-        with open(self.performance_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(self.performance_file, "rb") as f:
+            data = _json.loads(f.read())
         return {k: ExpertPerformance.from_dict(v) for k, v in data.items()}
 
     def save_performance(self, perf: dict[str, ExpertPerformance]):
         data = {k: v.to_dict() for k, v in perf.items()}
-        with open(self.performance_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_atomic(self.performance_file, _json.dumps(data, indent=True))
 
     def update_panel_performance(self, state: DebateState):
-        """Update expert performance metrics from a completed debate."""
+        """Update expert performance metrics from a completed debate.
+
+        Makes one pass over the moves, accumulating per-agent confidence sums
+        and claim counts, then folds them into the running averages once.
+        """
         perf = self.load_performance()
 
-        # Count challenges per agent
-        all_targets = {}
-        for move in state.moves:
-            for target in move.targets:
-                # Target format: M001_C1 → agent who made M001
-                all_targets[target] = move.agent_id
+        all_targets: set[str] = set()
+        prev_claims: dict[str, int] = {}
+        new_claims: dict[str, int] = {}
+        conf_sum: dict[str, float] = {}
+        claim_ids: dict[str, List[str]] = {}
 
         for move in state.moves:
+            # Only membership is needed: was claim M001_C1 challenged at all
+            all_targets.update(move.targets)
+
             if move.move_type in ("error", "synthesize"):
                 continue
 
             eid = move.agent_id
             if eid not in perf:
                 perf[eid] = ExpertPerformance(expert_id=eid)
-
             p = perf[eid]
-            p.debates_participated += 1
-            n_claims = len(move.claims)
-            p.total_claims += n_claims
-
-            if n_claims > 0:
-                avg_conf = sum(c.confidence for c in move.claims) / n_claims
-                # Running average
-                total = p.total_claims
-                prev = total - n_claims
-                if total > 0:
-                    p.avg_confidence = (
-                        (p.avg_confidence * prev + avg_conf * n_claims) / total
-                    )
+            if eid not in prev_claims:
+                prev_claims[eid] = p.total_claims
+                new_claims[eid] = 0
+                conf_sum[eid] = 0.0
+                claim_ids[eid] = []
 
+            p.debates_participated += 1
             p.challenges_made += len(move.targets)
+            new_claims[eid] += len(move.claims)
+            for claim in move.claims:
+                conf_sum[eid] += claim.confidence
+                claim_ids[eid].append(claim.id)
+
+        for eid, prev in prev_claims.items():
+            p = perf[eid]
+            n = new_claims[eid]
+            p.total_claims = prev + n
+            if n > 0:
+                # Running average over all claims ever made by this expert
+                p.avg_confidence = (p.avg_confidence * prev + conf_sum[eid]) / (prev + n)
 
             # Count how many times this agent's claims were targeted
-            for claim in move.claims:
-                if claim.id in all_targets:
-                    p.challenges_received += 1
+            p.challenges_received += sum(
+                1 for cid in claim_ids[eid] if cid in all_targets
+            )
 
         self.save_performance(perf)
 
@@ -280,8 +382,8 @@ class MemoryManager:
 
     @staticmethod
     def _load_json_list(path: str, cls):
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = _json.loads(f.read())
         if isinstance(data, list):
             return [cls.from_dict(d) for d in data]
         return []
@@ -26,7 +26,9 @@ def generate_report(
     w(f"**Total Moves**: {len(state.moves)}")
     w(f"**Total Claims**: {state.total_claims}")
     w(f"**Model**: {state.model} (synthesis: {state.synth_model})")
-    w(f"**Tokens**: {state.total_input_tokens:,} in / {state.total_output_tokens:,} out\n")
+    w(f"**Tokens**: {state.total_input_tokens:,} in / {state.total_output_tokens:,} out")
+    w(f"**Prompt Cache**: {state.total_cache_read_tokens:,} read / "
+      f"{state.total_cache_creation_tokens:,} written\n")
 
     # Expert panel table
     w("## Expert Panel\n")
@@ -2,21 +2,28 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import logging
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic, RateLimitError
+
+from think_tank import _json
 
 from think_tank.schemas import (
-    Expert, Panel, DebateSpec, DebateState, Move,
+    Expert, Panel, DebateSpec, DebateState, Move, RoundSpec, round_levels,
+)
+from think_tank.agent import (
+    DebateAgent, format_move, staged_synthesis_prompt, wants_more,
 )
-from think_tank.agent import DebateAgent
 from think_tank.memory import MemoryManager
 from think_tank.report import generate_report
 from think_tank.cost import compute_actual_cost
 
+logger = logging.getLogger(__name__)
 
 SYNTHESIZER_EXPERT = Expert(
     id="synthesizer",
@@ -25,6 +32,37 @@ SYNTHESIZER_EXPERT = Expert(
     background="Neutral facilitator that consolidates all expert contributions.",
 )
 
+# SDK-level retries for transient API errors (connection resets, 429, 5xx)
+API_MAX_RETRIES = 3
+
+# Default cap on in-flight agent API calls
+MAX_CONCURRENCY = 8
+
+# Further attempts once the SDK's own retries give up on a 429. The backoff
+# sleep happens outside the concurrency semaphore, so a throttled agent does
+# not hold a slot other agents could use.
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 2.0  # seconds, doubled on each attempt
+
+# Message Batches polling interval, doubled up to the cap while waiting
+BATCH_POLL_INITIAL = 5.0  # seconds
+BATCH_POLL_MAX = 60.0
+
+_RULE = "=" * 80
+
+# One worker shared by every runner, so memory reads and writes from
+# back-to-back runs never interleave. Created on first use.
+_memory_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _memory_worker() -> ThreadPoolExecutor:
+    global _memory_executor
+    if _memory_executor is None:
+        _memory_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="think-tank-memory",
+        )
+    return _memory_executor
+
 
 class DebateRunner:
     """Runs a multi-round structured debate with selective participation."""
@@ -39,13 +77,41 @@ class DebateRunner:
         output_dir: Optional[str] = None,
         memory_dir: Optional[str] = None,
         use_memory: bool = True,
+        client: Optional[Anthropic] = None,
+        async_client: Optional[AsyncAnthropic] = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        batch_mode: bool = False,
+        background_memory: bool = False,
     ):
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}"
+            )
         self.spec = spec
         self.panel = panel
-        self.client = Anthropic(api_key=api_key)
+        # One client of each kind (and so one pooled HTTP connection set) is
+        # shared by every agent. Debate moves go through the async client;
+        # the sync one serves post-debate lesson extraction.
+        self.client = client or Anthropic(
+            api_key=api_key, max_retries=API_MAX_RETRIES,
+        )
+        self.async_client = async_client or AsyncAnthropic(
+            api_key=api_key, max_retries=API_MAX_RETRIES,
+        )
         self.model = model
         self.synth_model = synth_model
         self.use_memory = use_memory
+        self.max_concurrency = max_concurrency
+        # Submit each round's expert moves through the Message Batches API
+        # (half price, but results can take minutes to hours)
+        self.batch_mode = batch_mode
+        # Optionally let run() return once the reports are written, leaving
+        # lesson extraction to finish on the memory worker (memory_future)
+        self.background_memory = background_memory
+        self.memory_future: Optional[Future] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._pending_writes: List[asyncio.Task] = []
+        self._moves_log = None  # moves.jsonl handle, open during run()
 
         # Output directory
         if output_dir:
@@ -54,8 +120,21 @@ class DebateRunner:
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
             slug = spec.title[:30].replace(" ", "_").replace("/", "-")
             self.output_dir = os.path.join("runs", f"{slug}_{ts}")
+        # Bad depends_on (unknown round, cycle) fails here, before any output
+        round_levels(spec.rounds)
         os.makedirs(self.output_dir, exist_ok=True)
 
+        # Output paths, joined once; braces in the directory are escaped so
+        # only the move fields are substituted per write
+        self._moves_log_file = os.path.join(self.output_dir, "moves.jsonl")
+        self._state_file = os.path.join(self.output_dir, "debate_state.json")
+        self._report_file = os.path.join(self.output_dir, "report.md")
+        self._cost_file = os.path.join(self.output_dir, "cost.json")
+        self._move_path_fmt = os.path.join(
+            self.output_dir.replace("{", "{{").replace("}", "}}"),
+            "move_{n:02d}_R{r}_{a}.json",
+        )
+
         # Memory
         if memory_dir is None:
             memory_dir = os.path.join(
@@ -70,6 +149,7 @@ class DebateRunner:
                 expert=expert,
                 client=self.client,
                 model=model,
+                async_client=self.async_client,
             )
         # Synthesizer on stronger model
         self.agents["synthesizer"] = DebateAgent(
@@ -77,10 +157,15 @@ class DebateRunner:
             client=self.client,
             model=synth_model,
             is_synthesizer=True,
+            async_client=self.async_client,
         )
 
     def run(self) -> DebateState:
         """Execute the full debate and return the final state."""
+        return asyncio.run(self._arun())
+
+    async def _arun(self) -> DebateState:
+        self._sem = asyncio.Semaphore(self.max_concurrency)
 
         state = DebateState(
             spec_title=self.spec.title,
@@ -94,131 +179,421 @@ class DebateRunner:
         # Load memory context
         memory_context = ""
         if self.memory:
-            memory_context = self.memory.load_context()
-
-        print(f"\n{'=' * 80}")
-        print(f"THINK TANK: {self.spec.title}")
-        print(f"{'=' * 80}")
-        print(f"Panel: {self.panel.name} ({len(self.panel.experts)} experts)")
-        print(f"Rounds: {len(self.spec.rounds)}")
-        print(f"Model: {self.model} (synthesis: {self.synth_model})")
-        print(f"Output: {self.output_dir}")
-        if memory_context:
-            print(f"Memory: {len(memory_context)} chars loaded")
-        print()
-
-        move_counter = 1
-
-        for rnd in self.spec.rounds:
-            print(f"\n{'=' * 80}")
-            print(f"ROUND {rnd.number}/{len(self.spec.rounds)}: {rnd.focus}")
-            print(f"Agents: {', '.join(rnd.agents)}")
-            print(f"{'=' * 80}\n")
-
-            for agent_id in rnd.agents:
-                agent = self.agents.get(agent_id)
-                if agent is None:
-                    print(f"  [SKIP] Agent '{agent_id}' not found in panel")
-                    continue
-
-                move_id = f"M{move_counter:03d}"
-                title = agent.expert.display_title()
-                print(f"  [{title}] Deliberating...")
-
-                try:
-                    move = agent.make_move(
-                        round_spec=rnd,
-                        problem_context=self.spec.context,
-                        prior_moves=state.moves,
-                        move_id=move_id,
-                        memory_context=memory_context,
-                        synthesizer_prompt=self.spec.synthesizer_prompt,
-                    )
-                    state.moves.append(move)
-                    state.total_input_tokens += move.input_tokens
-                    state.total_output_tokens += move.output_tokens
-
-                    # Save individual move
-                    move_file = os.path.join(
-                        self.output_dir,
-                        f"move_{move_counter:02d}_R{rnd.number}_{agent_id}.json",
-                    )
-                    with open(move_file, "w", encoding="utf-8") as f:
-                        json.dump(move.to_dict(), f, indent=2, ensure_ascii=False)
-
-                    n_claims = len(move.claims)
-                    preview = move.content[:120]
-                    print(f"  [{title}] {n_claims} claims | {preview}...")
-                    print(
-                        f"    tokens: {move.input_tokens} in / "
-                        f"{move.output_tokens} out"
-                    )
-
-                except Exception as e:
-                    print(f"  [{title}] ERROR: {e}")
-                    error_move = Move(
-                        move_id=move_id,
-                        agent_id=agent_id,
-                        agent_title=title,
-                        round=rnd.number,
-                        move_type="error",
-                        content=f"Agent error: {e!s}",
-                    )
-                    state.moves.append(error_move)
+            # Queued behind any extraction still running from an earlier run
+            memory_context = await asyncio.wrap_future(
+                _memory_worker().submit(self.memory.load_context)
+            )
 
-                move_counter += 1
+        # Context is fixed for the run; render each agent's system blocks now
+        for agent in self.agents.values():
+            agent.precompile(self.spec.context, memory_context)
+
+        logger.info("\n%s", _RULE)
+        logger.info("THINK TANK: %s", self.spec.title)
+        logger.info(_RULE)
+        logger.info("Panel: %s (%d experts)",
+                    self.panel.name, len(self.panel.experts))
+        logger.info("Rounds: %d", len(self.spec.rounds))
+        logger.info("Model: %s (synthesis: %s)", self.model, self.synth_model)
+        logger.info("Output: %s", self.output_dir)
+        if memory_context:
+            logger.info("Memory: %d chars loaded", len(memory_context))
+        logger.info("")
 
-            total_claims = state.total_claims
-            print(
-                f"\n  Round {rnd.number} complete. "
-                f"Total moves: {len(state.moves)}, "
-                f"Total claims: {total_claims}"
-            )
+        # One handle for the whole debate; each move is appended as a line
+        with open(self._moves_log_file, "wb") as self._moves_log:
+            await self._run_rounds(state, memory_context)
 
         # Finalize
         state.finished_at = datetime.now().isoformat()
 
-        print(f"\n{'=' * 80}")
-        print("DEBATE COMPLETE")
-        print(f"{'=' * 80}")
+        logger.info("\n%s", _RULE)
+        logger.info("DEBATE COMPLETE")
+        logger.info(_RULE)
 
         # Save full state
-        state_file = os.path.join(self.output_dir, "debate_state.json")
-        with open(state_file, "w", encoding="utf-8") as f:
-            json.dump(state.to_dict(), f, indent=2, ensure_ascii=False)
+        with open(self._state_file, "wb") as f:
+            f.write(_json.dumps(state.to_dict(), indent=True))
 
         # Generate report
-        report_file = os.path.join(self.output_dir, "report.md")
         report_text = generate_report(state, self.spec, self.panel)
-        with open(report_file, "w", encoding="utf-8") as f:
+        with open(self._report_file, "w", encoding="utf-8") as f:
             f.write(report_text)
 
         # Compute and save cost
         cost = compute_actual_cost(state)
-        cost_file = os.path.join(self.output_dir, "cost.json")
-        with open(cost_file, "w", encoding="utf-8") as f:
-            json.dump(cost, f, indent=2)
+        with open(self._cost_file, "wb") as f:
+            f.write(_json.dumps(cost, indent=True))
 
-        print(f"\nCost: ${cost['total_cost_usd']:.4f}")
-        print(f"  Agent: ${cost['agent_cost_usd']:.4f}")
-        print(f"  Synth: ${cost['synth_cost_usd']:.4f}")
+        logger.info("\nCost: $%.4f", cost["total_cost_usd"])
+        logger.info("  Agent: $%.4f", cost["agent_cost_usd"])
+        logger.info("  Synth: $%.4f", cost["synth_cost_usd"])
 
         # Post-debate: extract lessons
         if self.memory:
-            print("\nExtracting lessons from debate...")
+            if self.background_memory:
+                logger.info("\nExtracting lessons from debate in the background...")
+            else:
+                logger.info("\nExtracting lessons from debate...")
+            # The worker thread is joined at interpreter exit, so lessons
+            # are never cut off mid-write
+            self.memory_future = _memory_worker().submit(
+                self._extract_lessons, state,
+            )
+            if not self.background_memory:
+                await asyncio.wrap_future(self.memory_future)
+
+        logger.info("\n[SAVED] Results in: %s", self.output_dir)
+        logger.info("  - debate_state.json (%d moves)", len(state.moves))
+        logger.info("  - report.md")
+        logger.info("  - cost.json")
+        logger.info("  - moves.jsonl (one move per line)")
+        logger.info("  - move_XX_RY_agent.json (per-move details)")
+
+        return state
+
+    def _extract_lessons(self, state: DebateState):
+        try:
+            self.memory.extract_lessons_from_debate(
+                state, self.client, self.synth_model
+            )
+            self.memory.update_panel_performance(state)
+            logger.info("  Lessons saved to memory/")
+        except Exception as e:
+            logger.warning("  [WARN] Lesson extraction failed: %s", e)
+
+    async def _run_rounds(self, state: DebateState, memory_context: str):
+        rounds = self.spec.rounds
+        levels = round_levels(rounds)
+
+        # A final synthesizer-only round may start with the round it waits
+        # on, seeing only the moves recorded so far. That needs an earlier
+        # level to have produced moves; otherwise it could only ask for more.
+        staged, staged_prompt = None, None
+        last = len(rounds) - 1
+        if (self.spec.overlap_synthesis and len(levels) > 2
+                and levels[-1] == [last]
+                and rounds[last].agents == ["synthesizer"]):
+            staged = last
+            levels[-2].append(levels.pop()[0])
+            staged_prompt = staged_synthesis_prompt(self.spec.synthesizer_prompt)
+
+        # Move numbers follow spec order regardless of scheduling
+        jobs_by_round = []
+        move_counter = 1
+        for rnd in rounds:
+            jobs = []
+            for agent_id in rnd.agents:
+                agent = self.agents.get(agent_id)
+                if agent is not None:
+                    title = agent.expert.display_title
+                    jobs.append((move_counter, agent_id, agent, title))
+                    move_counter += 1
+            jobs_by_round.append(jobs)
+
+        for level in levels:
+            # Rounds in one level do not depend on each other: they all see
+            # the moves recorded before the level started and run together
+            prior = list(state.transcript)
+            outcomes = await asyncio.gather(*(
+                self._run_round(
+                    rounds[i], jobs_by_round[i], prior, memory_context,
+                    staged_prompt if i == staged else None,
+                )
+                for i in level
+            ))
+
+            # Moves were saved as they arrived; add them to the state in
+            # spec order so the transcript stays deterministic
+            for i, outcome in zip(level, outcomes):
+                if not outcome:
+                    continue
+                rnd = rounds[i]
+                if i == staged and any(
+                    not ok or wants_more(move) for _, move, ok in outcome
+                ):
+                    outcome = await self._rerun_synthesis(
+                        rnd, outcome, list(state.transcript), memory_context,
+                    )
+                moves = [move for _, move, _ in outcome]
+                state.add_moves(moves)
+                state.transcript.extend(map(format_move, moves))
+                # Error moves carry tokens only when a billed staged call
+                # preceded a failed re-run
+                for move in moves:
+                    state.total_input_tokens += move.input_tokens
+                    state.total_output_tokens += move.output_tokens
+                    state.total_cache_read_tokens += move.cache_read_input_tokens
+                    state.total_cache_creation_tokens += (
+                        move.cache_creation_input_tokens
+                    )
+                await self._flush_writes()
+
+                logger.info(
+                    "\n  Round %d complete. Total moves: %d, Total claims: %d",
+                    rnd.number, len(state.moves), state.total_claims,
+                )
+
+    async def _run_round(
+        self,
+        rnd: RoundSpec,
+        jobs: list,
+        prior: List[str],
+        memory_context: str,
+        synthesizer_prompt: Optional[str] = None,
+    ) -> list:
+        """Run one round's moves; returns [(job, move, ok)] in job order.
+
+        Each move is saved as soon as its result arrives. A staged synthesis
+        that asks for more is not saved, since it will be re-run.
+        """
+        staged = synthesizer_prompt is not None
+        logger.info("\n%s", _RULE)
+        logger.info("ROUND %d/%d: %s",
+                    rnd.number, len(self.spec.rounds), rnd.focus)
+        logger.info("Agents: %s", ", ".join(rnd.agents))
+        logger.info("%s\n", _RULE)
+
+        missing = [a for a in rnd.agents if a not in self.agents]
+        if missing:
+            logger.info("  [SKIP] Not found in panel: %s", ", ".join(missing))
+        if not jobs:
+            logger.info("  [SKIP] No agents to run in this round")
+            return []
+
+        for _, _, _, title in jobs:
+            logger.info("  [%s] Deliberating...", title)
+
+        outcome = []
+        if rnd.sequential:
+            # Each agent also sees the moves made earlier in this round
+            transcript = list(prior)
+            for job in jobs:
+                result = await self._amove(
+                    job[2], rnd, job[0], transcript, memory_context,
+                    synthesizer_prompt,
+                )
+                job, move, ok = self._settle(rnd, job, result, staged)
+                transcript.append(format_move(move))
+                outcome.append((job, move, ok))
+            return outcome
+
+        # Every agent sees the same prior moves, so their API calls are
+        # independent and can overlap. In batch mode expert moves go through
+        # one message batch; the synthesizer always runs live.
+        batch_jobs, live_jobs = [], []
+        for job in jobs:
+            if self.batch_mode and not job[2].is_synthesizer:
+                batch_jobs.append(job)
+            else:
+                live_jobs.append(job)
+
+        async def run_batch():
+            results = await self._abatch(rnd, batch_jobs, prior, memory_context)
+            missing = RuntimeError("missing from batch results")
+            return [
+                self._settle(rnd, job, results.get(job[0], missing), staged)
+                for job in batch_jobs
+            ]
+
+        async def run_live(job):
+            result = await self._amove(
+                job[2], rnd, job[0], prior, memory_context, synthesizer_prompt,
+            )
+            return self._settle(rnd, job, result, staged)
+
+        batched, *live = await asyncio.gather(
+            run_batch(), *map(run_live, live_jobs),
+        )
+        settled = {entry[0][0]: entry for entry in batched + live}
+        return [settled[job[0]] for job in jobs]
+
+    async def _rerun_synthesis(
+        self,
+        rnd: RoundSpec,
+        staged: list,
+        transcript: List[str],
+        memory_context: str,
+    ) -> list:
+        """Re-run a staged synthesis round on the complete transcript."""
+        logger.info("  [Synthesizer] Re-running round %d with all %d moves",
+                    rnd.number, len(transcript))
+        outcome = []
+        for job, old, _ in staged:
+            result = await self._amove(
+                job[2], rnd, job[0], transcript, memory_context,
+            )
+            # The staged call was billed too, whether or not the re-run works
+            if isinstance(result, Exception):
+                entry = self._settle(rnd, job, result)
+                _add_usage(entry[1], old)
+            else:
+                _add_usage(result, old)
+                entry = self._settle(rnd, job, result)
+            outcome.append(entry)
+        return outcome
+
+    async def _amove(
+        self,
+        agent: DebateAgent,
+        rnd: RoundSpec,
+        n: int,
+        prior_transcript: List[str],
+        memory_context: str,
+        synthesizer_prompt: Optional[str] = None,
+    ):
+        """Run one agent's move, returning the exception instead of raising."""
+        if synthesizer_prompt is None:
+            synthesizer_prompt = self.spec.synthesizer_prompt
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
             try:
-                self.memory.extract_lessons_from_debate(
-                    state, self.client, self.synth_model
+                async with self._sem:
+                    return await agent.amake_move(
+                        round_spec=rnd,
+                        problem_context=self.spec.context,
+                        prior_transcript=prior_transcript,
+                        move_id=f"M{n:03d}",
+                        memory_context=memory_context,
+                        synthesizer_prompt=synthesizer_prompt,
+                    )
+            except RateLimitError as e:
+                if attempt == RATE_LIMIT_RETRIES:
+                    return e
+                delay = RATE_LIMIT_BACKOFF * 2 ** attempt
+                logger.info(
+                    "  [%s] Rate limited, retrying in %.0fs",
+                    agent.expert.display_title, delay,
                 )
-                self.memory.update_panel_performance(state)
-                print("  Lessons saved to memory/")
+                await asyncio.sleep(delay)
             except Exception as e:
-                print(f"  [WARN] Lesson extraction failed: {e}")
+                return e
+
+    async def _abatch(
+        self,
+        rnd: RoundSpec,
+        jobs: list,
+        prior_transcript: List[str],
+        memory_context: str,
+    ) -> dict:
+        """Submit moves as one Message Batch and wait for it to finish.
+
+        Returns {move number: Move or Exception}; a failed batch turns into
+        an exception for every job in it.
+        """
+        if not jobs:
+            return {}
+
+        by_id = {}
+        requests = []
+        for n, _, agent, _ in jobs:
+            move_id = f"M{n:03d}"
+            by_id[move_id] = (n, agent)
+            requests.append(agent.batch_request(
+                round_spec=rnd,
+                problem_context=self.spec.context,
+                prior_transcript=prior_transcript,
+                move_id=move_id,
+                memory_context=memory_context,
+                synthesizer_prompt=self.spec.synthesizer_prompt,
+            ))
+
+        batches = self.async_client.messages.batches
+        results = {}
+        try:
+            batch = await batches.create(requests=requests)
+            logger.info("  [BATCH] %s: %d requests submitted",
+                        batch.id, len(requests))
+            delay = BATCH_POLL_INITIAL
+            while batch.processing_status != "ended":
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, BATCH_POLL_MAX)
+                batch = await batches.retrieve(batch.id)
+
+            async for entry in await batches.results(batch.id):
+                n, agent = by_id[entry.custom_id]
+                result = entry.result
+                if result.type == "succeeded":
+                    move = agent.move_from_message(
+                        result.message, entry.custom_id, rnd.number,
+                    )
+                    move.batched = True
+                    results[n] = move
+                else:  # errored | canceled | expired
+                    results[n] = RuntimeError(f"batch request {result.type}")
+        except Exception as e:
+            return {n: e for n, *_ in jobs}
+        return results
+
+    async def _flush_writes(self):
+        """Wait for this round's move-file writes, warning on failures."""
+        if not self._pending_writes:
+            return
+        results = await asyncio.gather(
+            *self._pending_writes, return_exceptions=True,
+        )
+        self._pending_writes.clear()
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("  [WARN] Could not save move file: %s", result)
+
+    @staticmethod
+    def _as_move(rnd: RoundSpec, job, result):
+        """(move, ok) for an agent result; exceptions become error moves."""
+        if not isinstance(result, Exception):
+            return result, True
+        n, agent_id, _, title = job
+        logger.error("  [%s] ERROR: %s", title, result)
+        return Move(
+            move_id=f"M{n:03d}",
+            agent_id=agent_id,
+            agent_title=title,
+            round=rnd.number,
+            move_type="error",
+            content=f"Agent error: {result!s}",
+        ), False
+
+    def _settle(self, rnd: RoundSpec, job, result, staged: bool = False):
+        """(job, move, ok) for a result, saving successful moves right away."""
+        move, ok = self._as_move(rnd, job, result)
+        if ok and not (staged and wants_more(move)):
+            self._save_move(rnd, job, move)
+        return job, move, ok
+
+    def _save_move(self, rnd: RoundSpec, job, move: Move):
+        """Write a finished move to moves.jsonl and its own file."""
+        n, agent_id, _, title = job
+        # Save individual move
+        move_file = self._move_path_fmt.format(
+            n=n, r=rnd.number, a=agent_id,
+        )
+        # Compact JSON; only debate_state.json is indented for reading.
+        # The log line is flushed at once so a crash keeps finished moves;
+        # the per-move file is written off the event loop while other calls
+        # are still in flight (the level awaits it before finishing).
+        data = _json.dumps(move.to_dict())
+        self._moves_log.write(data + b"\n")
+        self._moves_log.flush()
+        self._pending_writes.append(asyncio.create_task(
+            asyncio.to_thread(_write_bytes, move_file, data)
+        ))
+
+        n_claims = len(move.claims)
+        preview = move.content[:120]
+        logger.info("  [%s] %d claims | %s...", title, n_claims, preview)
+        logger.info(
+            "    tokens: %s in / %s out / %s cached",
+            move.input_tokens, move.output_tokens,
+            move.cache_read_input_tokens,
+        )
 
-        print(f"\n[SAVED] Results in: {self.output_dir}")
-        print(f"  - debate_state.json ({len(state.moves)} moves)")
-        print(f"  - report.md")
-        print(f"  - cost.json")
-        print(f"  - move_XX_RY_agent.json (per-move details)")
 
-        return state
+def _add_usage(move: Move, other: Move):
+    move.input_tokens += other.input_tokens
+    move.output_tokens += other.output_tokens
+    move.cache_read_input_tokens += other.cache_read_input_tokens
+    move.cache_creation_input_tokens += other.cache_creation_input_tokens
+
+
+def _write_bytes(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
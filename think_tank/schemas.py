@@ -2,16 +2,30 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional
+from itertools import islice
+from typing import List, Dict, Optional, Union
+
+
+def _iso_from_ns(ns: int) -> str:
+    """Local ISO timestamp for a time_ns() value ("" for 0)."""
+    if not ns:
+        return ""
+    secs, rem = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(secs).replace(
+        microsecond=rem // 1000).isoformat()
 
 
 # ── Expert definition ──────────────────────────────────────
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Expert:
-    """An expert persona that participates in debate."""
+    """An expert persona that participates in debate.
+
+    Immutable, so display_title is formatted once at construction.
+    """
     id: str
     name: str
     title: str
@@ -19,26 +33,35 @@ class Expert:
     bias: str = ""
     lens: str = ""
     domain: str = ""
+    display_title: str = field(init=False, repr=False, compare=False)
 
-    def display_title(self) -> str:
-        return f"{self.name} ({self.title})"
+    def __post_init__(self):
+        object.__setattr__(self, "display_title", f"{self.name} ({self.title})")
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "name": self.name,
+            "title": self.title,
+            "background": self.background,
+            "bias": self.bias,
+            "lens": self.lens,
+            "domain": self.domain,
+        }
 
 
 # ── Claim / Evidence ───────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class Evidence:
     source: str
     quote: str = ""
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {"source": self.source, "quote": self.quote}
 
 
-@dataclass
+@dataclass(slots=True)
 class Claim:
     """A specific, falsifiable claim made during debate."""
     id: str
@@ -48,15 +71,25 @@ class Claim:
     assumptions: List[str] = field(default_factory=list)
     stance: str = "neutral"  # pro | contra | neutral
 
+    @property
+    def short(self) -> str:
+        """Claim text truncated for prompt transcripts."""
+        return self.text[:250]
+
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["evidence"] = [e.to_dict() for e in self.evidence]
-        return d
+        return {
+            "id": self.id,
+            "text": self.text,
+            "confidence": self.confidence,
+            "evidence": [e.to_dict() for e in self.evidence],
+            "assumptions": list(self.assumptions),
+            "stance": self.stance,
+        }
 
 
 # ── Move (single agent contribution) ──────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class Move:
     """A single debate contribution from one agent in one round."""
     move_id: str
@@ -67,14 +100,39 @@ class Move:
     content: str = ""
     claims: List[Claim] = field(default_factory=list)
     targets: List[str] = field(default_factory=list)
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
-    input_tokens: int = 0
+    # Wall-clock ns for new moves, formatted as ISO only in to_dict; a
+    # loaded move keeps its serialized value exactly as it was read
+    timestamp: Union[int, str] = field(default_factory=time.time_ns)
+    input_tokens: int = 0  # uncached input only, as reported by the API
     output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    batched: bool = False  # produced via the Message Batches API
+
+    @property
+    def preview(self) -> str:
+        """Move content truncated for prompt transcripts."""
+        return self.content[:1500]
 
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["claims"] = [c.to_dict() for c in self.claims]
-        return d
+        return {
+            "move_id": self.move_id,
+            "agent_id": self.agent_id,
+            "agent_title": self.agent_title,
+            "round": self.round,
+            "move_type": self.move_type,
+            "content": self.content,
+            "claims": [c.to_dict() for c in self.claims],
+            "targets": list(self.targets),
+            "timestamp": (_iso_from_ns(self.timestamp)
+                          if isinstance(self.timestamp, int)
+                          else self.timestamp),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens,
+            "batched": self.batched,
+        }
 
     @classmethod
     def from_dict(cls, d: dict) -> Move:
@@ -101,66 +159,149 @@ class Move:
             timestamp=d.get("timestamp", ""),
             input_tokens=d.get("input_tokens", 0),
             output_tokens=d.get("output_tokens", 0),
+            cache_read_input_tokens=d.get("cache_read_input_tokens", 0),
+            cache_creation_input_tokens=d.get("cache_creation_input_tokens", 0),
+            batched=d.get("batched", False),
         )
 
 
 # ── Round definition ───────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class RoundSpec:
     """A single debate round with focus question and assigned agents."""
     number: int
     focus: str
     question: str
     agents: List[str]  # agent IDs
+    # Run agents one after another, each seeing the moves made before it in
+    # this round; by default a round's agents run concurrently
+    sequential: bool = False
+    # Round numbers whose moves this round needs; None means the previous
+    # round. Rounds with no unmet dependencies on each other run concurrently.
+    depends_on: Optional[List[int]] = None
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "number": self.number,
+            "focus": self.focus,
+            "question": self.question,
+            "agents": list(self.agents),
+            "sequential": self.sequential,
+            "depends_on": (
+                list(self.depends_on) if self.depends_on is not None else None
+            ),
+        }
+
+
+def round_levels(rounds: List[RoundSpec]) -> List[List[int]]:
+    """Group round indices into levels whose rounds can run concurrently.
+
+    depends_on lists round numbers; None means "the previous round in the
+    spec", so specs that never set it run strictly in order. Raises
+    ValueError for unknown round numbers and dependency cycles.
+    """
+    index = {r.number: i for i, r in enumerate(rounds)}
+    deps = []
+    for i, rnd in enumerate(rounds):
+        if rnd.depends_on is None:
+            deps.append([i - 1] if i else [])
+            continue
+        unknown = [d for d in rnd.depends_on if d not in index]
+        if unknown:
+            raise ValueError(
+                f"Round {rnd.number}: depends_on unknown round(s) {unknown}"
+            )
+        deps.append([index[d] for d in rnd.depends_on])
+
+    level_of: Dict[int, int] = {}
+    visiting = set()
+
+    def level(i: int) -> int:
+        if i in level_of:
+            return level_of[i]
+        if i in visiting:
+            raise ValueError(f"Round {rounds[i].number}: dependency cycle")
+        visiting.add(i)
+        level_of[i] = 1 + max((level(d) for d in deps[i]), default=-1)
+        visiting.discard(i)
+        return level_of[i]
+
+    levels: Dict[int, List[int]] = {}
+    for i in range(len(rounds)):
+        levels.setdefault(level(i), []).append(i)
+    return [levels[k] for k in sorted(levels)]
 
 
 # ── Debate specification ───────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class DebateSpec:
     """Full problem specification for a debate."""
     title: str
     context: str
     rounds: List[RoundSpec]
     synthesizer_prompt: str = ""
+    # Start a final synthesizer-only round alongside the round before it
+    overlap_synthesis: bool = False
 
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["rounds"] = [r.to_dict() for r in self.rounds]
-        return d
+        return {
+            "title": self.title,
+            "context": self.context,
+            "rounds": [r.to_dict() for r in self.rounds],
+            "synthesizer_prompt": self.synthesizer_prompt,
+            "overlap_synthesis": self.overlap_synthesis,
+        }
 
 
 # ── Panel (collection of experts) ─────────────────────────
 
+def _index_experts(experts: List[Expert]) -> Dict[str, Expert]:
+    index: Dict[str, Expert] = {}
+    for e in experts:
+        index.setdefault(e.id, e)  # first definition wins
+    return index
+
+
 @dataclass
 class Panel:
-    """A collection of expert personas."""
+    """A collection of expert personas.
+
+    The id index is built at construction and rebuilt whenever ``experts``
+    is reassigned; in-place edits to the list are not tracked.
+    """
     name: str
     description: str = ""
     experts: List[Expert] = field(default_factory=list)
+    _by_id: Dict[str, Expert] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._by_id = _index_experts(self.experts)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Skipped while __init__ runs; __post_init__ builds the first index
+        if name == "experts" and hasattr(self, "_by_id"):
+            super().__setattr__("_by_id", _index_experts(value))
 
     def get_expert(self, expert_id: str) -> Optional[Expert]:
-        for e in self.experts:
-            if e.id == expert_id:
-                return e
-        return None
+        return self._by_id.get(expert_id)
 
     def list_ids(self) -> List[str]:
-        return [e.id for e in self.experts]
+        return list(self._by_id)
 
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["experts"] = [e.to_dict() for e in self.experts]
-        return d
+        return {
+            "name": self.name,
+            "description": self.description,
+            "experts": [e.to_dict() for e in self.experts],
+        }
 
 
 # ── Debate state (full run) ───────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class DebateState:
     """Complete state of a debate run."""
     spec_title: str
@@ -174,10 +315,38 @@ class DebateState:
     finished_at: str = ""
     total_input_tokens: int = 0
     total_output_tokens: int = 0
+    total_cache_read_tokens: int = 0
+    total_cache_creation_tokens: int = 0
+    # Prompt fragment per move (parallel to moves); runtime only, not saved
+    transcript: List[str] = field(default_factory=list, repr=False)
+    # Claims counted over the first _claims_seen moves of _claims_list;
+    # total_claims catches up on appends and recounts if moves is replaced
+    # or shrinks. Edits to the claims of an already-counted move are not seen.
+    _claims: int = field(init=False, default=0, repr=False, compare=False)
+    _claims_seen: int = field(init=False, default=0, repr=False, compare=False)
+    _claims_list: Optional[list] = field(
+        init=False, default=None, repr=False, compare=False,
+    )
+
+    def add_move(self, move: Move):
+        """Append a move."""
+        self.moves.append(move)
+
+    def add_moves(self, moves: List[Move]):
+        """Append a batch of moves (e.g. one round) with a single extend."""
+        self.moves.extend(moves)
 
     @property
     def total_claims(self) -> int:
-        return sum(len(m.claims) for m in self.moves)
+        moves = self.moves
+        if self._claims_list is not moves or self._claims_seen > len(moves):
+            self._claims_list, self._claims, self._claims_seen = moves, 0, 0
+        if self._claims_seen < len(moves):
+            self._claims += sum(
+                len(m.claims) for m in islice(moves, self._claims_seen, None)
+            )
+            self._claims_seen = len(moves)
+        return self._claims
 
     def to_dict(self) -> dict:
         return {
@@ -191,6 +360,8 @@ class DebateState:
             "total_claims": self.total_claims,
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
+            "total_cache_read_tokens": self.total_cache_read_tokens,
+            "total_cache_creation_tokens": self.total_cache_creation_tokens,
             "started_at": self.started_at,
             "finished_at": self.finished_at,
             "moves": [m.to_dict() for m in self.moves],
@@ -209,14 +380,16 @@ class DebateState:
             finished_at=d.get("finished_at", ""),
             total_input_tokens=d.get("total_input_tokens", 0),
             total_output_tokens=d.get("total_output_tokens", 0),
+            total_cache_read_tokens=d.get("total_cache_read_tokens", 0),
+            total_cache_creation_tokens=d.get("total_cache_creation_tokens", 0),
+            moves=[Move.from_dict(m) for m in d.get("moves", [])],
         )
-        state.moves = [Move.from_dict(m) for m in d.get("moves", [])]
         return state
 
 
 # ── Self-development models ────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class Lesson:
     """A lesson extracted from a completed debate."""
     id: str
@@ -228,14 +401,28 @@ class Lesson:
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "text": self.text,
+            "source_debate": self.source_debate,
+            "source_round": self.source_round,
+            "category": self.category,
+            "confidence": self.confidence,
+            "created_at": self.created_at,
+        }
 
     @classmethod
     def from_dict(cls, d: dict) -> Lesson:
         return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
 
 
-@dataclass
+def brier_score(probability: float, outcome: bool) -> float:
+    """Squared error of a probability forecast against a yes/no outcome."""
+    actual = 1.0 if outcome else 0.0
+    return (probability - actual) ** 2
+
+
+@dataclass(slots=True)
 class Forecast:
     """A falsifiable prediction with a deadline for Brier score tracking."""
     id: str
@@ -253,13 +440,22 @@ class Forecast:
     def brier_score(self) -> Optional[float]:
         if not self.resolved or self.outcome is None:
             return None
-        actual = 1.0 if self.outcome else 0.0
-        return (self.probability - actual) ** 2
+        return brier_score(self.probability, self.outcome)
 
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["brier_score"] = self.brier_score
-        return d
+        return {
+            "id": self.id,
+            "text": self.text,
+            "probability": self.probability,
+            "deadline": self.deadline,
+            "source_debate": self.source_debate,
+            "source_claim_id": self.source_claim_id,
+            "resolved": self.resolved,
+            "outcome": self.outcome,
+            "resolved_at": self.resolved_at,
+            "created_at": self.created_at,
+            "brier_score": self.brier_score,
+        }
 
     @classmethod
     def from_dict(cls, d: dict) -> Forecast:
@@ -267,7 +463,7 @@ class Forecast:
         return cls(**valid)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExpertPerformance:
     """Tracks per-expert performance across debates."""
     expert_id: str
@@ -278,7 +474,14 @@ class ExpertPerformance:
     challenges_made: int = 0
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "expert_id": self.expert_id,
+            "debates_participated": self.debates_participated,
+            "total_claims": self.total_claims,
+            "avg_confidence": self.avg_confidence,
+            "challenges_received": self.challenges_received,
+            "challenges_made": self.challenges_made,
+        }
 
     @classmethod
     def from_dict(cls, d: dict) -> ExpertPerformance: